@@ -1,10 +1,25 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from routers.tts_router import router as tts_router
+from services.tts_engine import get_engine
+from services.job_queue import get_job_queue
 
-app = FastAPI(title="TTS-SST API", version="1.0.0")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Carrega modelos, vozes, embedder e Qdrant uma única vez por processo
+    engine = get_engine()
+    engine.startup()
+    app.state.engine = engine
+    jobs = get_job_queue()
+    jobs.start()
+    yield
+    jobs.stop()
+    engine.shutdown()
+
+app = FastAPI(title="TTS-SST API", version="1.0.0", lifespan=lifespan)
 
 app.include_router(tts_router, prefix="/api/v1", tags=["TTS"])
 
 @app.get("/")
 async def root():
-    return {"message": "TTS-SST API is running"}
\ No newline at end of file
+    return {"message": "TTS-SST API is running"}
@@ -1,34 +1,124 @@
 from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel, Field
-from typing import Optional
-from services.tts_service import TTSService
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import BaseModel, Field, field_validator
+from datetime import datetime
+from typing import Literal, Optional
+from services.tts_service import SUPPORTED_LANGS, TTSService
 
 router = APIRouter()
 tts_service = TTSService()
 
+def check_langs(langs: list[str]) -> list[str]:
+    # Códigos desconhecidos eram ignorados e o job terminava sem gerar nada: agora é 422
+    unknown = [lang for lang in langs if lang not in SUPPORTED_LANGS]
+    if unknown:
+        raise ValueError(f"Unsupported languages: {', '.join(unknown)} (use: {', '.join(SUPPORTED_LANGS)})")
+    return langs
+
 class RunTTSRequest(BaseModel):
     model: str = Field(default="fast", description="Model type: fast or reasoning")
     specialist: Optional[str] = Field(default=None, description="Specialist: grammar or daily")
-    langs: list[str] = Field(default_factory=lambda: ["en", "es"], description="Languages to generate: en, es")
+    langs: list[str] = Field(default_factory=lambda: ["en", "es"], min_length=1, description="Languages to generate: en, es, pt")
     topic_subject: Optional[str] = Field(default=None, description="Subject to suggest topics")
     selected_topic: Optional[str] = Field(default=None, description="Selected topic text for generation")
+    priority: int = Field(default=10, description="Job priority (lower runs first)")
+
+    @field_validator("langs")
+    @classmethod
+    def known_langs(cls, langs: list[str]) -> list[str]:
+        return check_langs(langs)
+
+class StreamTTSRequest(BaseModel):
+    model: str = Field(default="fast", description="Model type: fast or reasoning")
+    specialist: Optional[str] = Field(default=None, description="Specialist: grammar or daily")
+    lang: str = Field(default="en", description="Language to generate: en, es, pt")
+    selected_topic: Optional[str] = Field(default=None, description="Selected topic text for generation")
+    format: Literal["wav", "pcm"] = Field(default="wav", description="wav (streaming header) or pcm (raw s16le mono)")
+
+    @field_validator("lang")
+    @classmethod
+    def known_lang(cls, lang: str) -> str:
+        # Mesma validação do /run-tts: os dois endpoints seguem LANGUAGE_PROFILES
+        return check_langs([lang])[0]
+
+class BatchRequest(BaseModel):
+    manifest_path: str = Field(..., description="Manifest (.csv, .jsonl or .parquet): lang, topic, specialist, model, sarah_voice, leo_voice, item_id")
+    output_dir: str = Field(default="outputs/batch", description="Output directory; rerunning with the same directory resumes the batch")
+    queue_size: int = Field(default=2, description="Interviews whose texts may be generated ahead of synthesis")
+    priority: int = Field(default=20, description="Job priority (lower runs first)")
 
 class QueryQdrantRequest(BaseModel):
     query_text: str = Field(..., description="Query text for search")
+    top_k: int = Field(default=1, ge=1, le=100, description="Generated dialogues to return (nearest first); each comes with its corrected pair fetched by pair id")
+    offset: int = Field(default=0, ge=0, description="Pagination offset")
+    language: Optional[str] = Field(default=None, description="Filter by language: en, es, pt")
+    specialist: Optional[str] = Field(default=None, description="Filter by specialist: grammar or daily")
+    model: Optional[str] = Field(default=None, description="Filter by model: fast or reasoning")
+    topic: Optional[str] = Field(default=None, description="Filter by selected topic")
+    since: Optional[datetime] = Field(default=None, description="Only dialogues created at or after this time")
+    until: Optional[datetime] = Field(default=None, description="Only dialogues created at or before this time")
 
-@router.post("/run-tts")
+@router.post("/run-tts", status_code=202)
 async def run_tts(request: RunTTSRequest):
+    # Apenas enfileira: a geração roda no pool de workers, fora do event loop
     try:
-        result = tts_service.run_tts(request.model, request.specialist, request.langs, request.topic_subject, request.selected_topic)
-        return {"status": "success", "output": result}
+        job = tts_service.submit_run_tts(request.model, request.specialist, request.langs, request.topic_subject, request.selected_topic, request.priority)
+        return {"status": "queued", "job_id": job.id}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.post("/batch", status_code=202)
+async def batch(request: BatchRequest):
+    try:
+        job = tts_service.submit_batch(request.manifest_path, request.output_dir, request.queue_size, request.priority)
+        return {"status": "queued", "job_id": job.id}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/stream-tts")
+def stream_tts(request: StreamTTSRequest):
+    # Áudio sai fala a fala enquanto o LLM ainda gera o restante do diálogo
+    try:
+        chunks, sample_rate = tts_service.stream_tts(request.model, request.specialist, request.lang, request.selected_topic, request.format)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    media_type = "audio/wav" if request.format == "wav" else f"audio/L16; rate={sample_rate}; channels=1"
+    return StreamingResponse(chunks, media_type=media_type, headers={"X-Sample-Rate": str(sample_rate)})
+
+@router.get("/voices")
+async def list_voices(lang: Optional[str] = None, gender: Optional[str] = None):
+    # Lido do índice consolidado (models/voices_index.parquet), mantido em memória
+    return {"status": "success", "voices": tts_service.list_voices(lang, gender)}
+
+@router.get("/health/tts")
+def health_tts(refresh: bool = False):
+    # Self-test das vozes (resultado do startup em cache; refresh=true roda de novo)
+    report = tts_service.health(refresh)
+    return JSONResponse(report, status_code=200 if report["ok"] else 503)
+
+@router.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    job = tts_service.get_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job não encontrado: {job_id}")
+    return job.to_dict()
+
+# Rotas síncronas (def) rodam no threadpool do FastAPI e não bloqueiam o event loop
 @router.post("/query-qdrant")
-async def query_qdrant(request: QueryQdrantRequest):
+def query_qdrant(request: QueryQdrantRequest):
     try:
-        result = tts_service.query_qdrant(request.query_text)
-        return {"status": "success", "data": result}
+        result = tts_service.query_qdrant(
+            request.query_text,
+            request.top_k,
+            request.offset,
+            language=request.language,
+            specialist=request.specialist,
+            model=request.model,
+            topic=request.topic,
+            since=request.since.timestamp() if request.since else None,
+            until=request.until.timestamp() if request.until else None,
+        )
+        return {"status": "success", "data": result["report"], "results": result["results"]}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -39,7 +129,7 @@ class SuggestTopicsRequest(BaseModel):
     subject: str = Field(...)
 
 @router.post("/suggest-topics")
-async def suggest_topics(request: SuggestTopicsRequest):
+def suggest_topics(request: SuggestTopicsRequest):
     try:
         topics = tts_service.suggest_topics(request.model, request.specialist, request.lang, request.subject)
         return {"status": "success", "topics": topics}
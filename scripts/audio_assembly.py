@@ -0,0 +1,69 @@
+from typing import Mapping, Optional, Sequence, Union
+import numpy as np
+import soundfile as sf
+from audio_integrity import AudioStats
+
+GapSpec = Union[float, Mapping[str, float]]
+
+
+def gap_samples(speakers: Sequence[str], sample_rate: int, gaps: GapSpec) -> list[int]:
+    """Silêncio (em amostras) após cada segmento; `gaps` é um valor único ou um mapa por speaker."""
+    if isinstance(gaps, Mapping):
+        default = gaps.get("default", 0.5)
+        return [int(gaps.get(spk, default) * sample_rate) for spk in speakers]
+    return [int(gaps * sample_rate)] * len(speakers)
+
+
+def assemble_segments(
+    segments: list[Optional[np.ndarray]],
+    speakers: Sequence[str],
+    sample_rate: int,
+    gaps: GapSpec = 0.5,
+) -> np.ndarray:
+    """Copia segmentos e silêncios para um único buffer int16 já dimensionado.
+
+    O buffer vem de np.zeros (páginas só são ocupadas ao serem escritas, e os
+    silêncios já ficam zerados) e cada segmento é liberado da lista assim que
+    copiado, então o pico de memória fica perto de 1x o áudio final em vez de
+    2x (lista + np.concatenate).
+    """
+    gaps_n = gap_samples(speakers, sample_rate, gaps)
+    total = sum(len(seg) for seg in segments if seg is not None) + sum(gaps_n)
+    out = np.zeros(total, dtype=np.int16)
+    pos = 0
+    for i, gap in enumerate(gaps_n):
+        seg = segments[i]
+        if seg is not None:
+            out[pos:pos + len(seg)] = seg
+            pos += len(seg)
+            segments[i] = None
+        pos += gap
+    return out
+
+
+def write_segments(
+    path: str,
+    segments: list[Optional[np.ndarray]],
+    speakers: Sequence[str],
+    sample_rate: int,
+    gaps: GapSpec = 0.5,
+    format: str = "FLAC",
+    subtype: str = "PCM_16",
+    stats: Optional[AudioStats] = None,
+) -> None:
+    """Escreve segmentos e silêncios direto no arquivo, sem montar o áudio completo em memória.
+    Com `stats`, as estatísticas de integridade são acumuladas durante a escrita (sem reler o arquivo)."""
+    gaps_n = gap_samples(speakers, sample_rate, gaps)
+    silence = np.zeros(max(gaps_n, default=0), dtype=np.int16)
+    with sf.SoundFile(path, "w", samplerate=sample_rate, channels=1, format=format, subtype=subtype) as f:
+        for i, gap in enumerate(gaps_n):
+            seg = segments[i]
+            if seg is not None:
+                f.write(seg)
+                if stats is not None:
+                    stats.update(seg)
+                segments[i] = None
+            if gap:
+                f.write(silence[:gap])
+                if stats is not None:
+                    stats.update_silence(gap)
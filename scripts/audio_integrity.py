@@ -0,0 +1,148 @@
+import os
+from dataclasses import dataclass
+from typing import Optional
+import numpy as np
+import soundfile as sf
+
+# Blocos limitam os temporários da validação (64k amostras ≈ 256 KB em float32)
+BLOCK_FRAMES = 65536
+# Janela de 20 ms para a razão de silêncio; janelas com RMS abaixo de SILENCE_RMS contam como silêncio
+SILENCE_WINDOW_SECONDS = 0.02
+SILENCE_RMS = 100.0
+CLIP_LEVEL = 32767
+
+
+@dataclass
+class AudioStats:
+    """Estatísticas acumuladas bloco a bloco (escala int16), sem guardar o áudio.
+
+    Alimentada com o buffer em memória antes da codificação, com os segmentos
+    enquanto são gravados, ou com `soundfile.blocks` ao validar um arquivo.
+    """
+    sample_rate: int
+    frames: int = 0
+    sum_squares: float = 0.0
+    peak: int = 0
+    clipped: int = 0
+    windows: int = 0
+    silent_windows: int = 0
+
+    def __post_init__(self):
+        self._window = max(1, int(self.sample_rate * SILENCE_WINDOW_SECONDS))
+        self._carry = np.zeros(0, dtype=np.float32)
+
+    def update(self, block: np.ndarray) -> None:
+        """Acumula um bloco mono (int16, ou float em [-1, 1] do soundfile)."""
+        for start in range(0, len(block), BLOCK_FRAMES):
+            part = block[start:start + BLOCK_FRAMES]
+            if part.dtype.kind == "f":
+                part = part * 32767.0
+            x = part.astype(np.float32, copy=False)
+            self.frames += len(x)
+            self.sum_squares += float(np.dot(x, x))
+            if len(x):
+                self.peak = max(self.peak, int(np.max(np.abs(x))))
+            self.clipped += int(np.count_nonzero(np.abs(x) >= CLIP_LEVEL))
+            self._update_windows(x)
+
+    def update_silence(self, frames: int) -> None:
+        """Silêncio digital (ex: pausas entre falas) sem materializar o array."""
+        if frames <= 0:
+            return
+        if len(self._carry):
+            fill = min(frames, self._window - len(self._carry))
+            self._update_windows(np.zeros(fill, dtype=np.float32))
+            frames -= fill
+            self.frames += fill
+        full = frames // self._window
+        self.windows += full
+        self.silent_windows += full
+        self.frames += full * self._window
+        rest = frames - full * self._window
+        if rest:
+            self._carry = np.zeros(rest, dtype=np.float32)
+            self.frames += rest
+
+    def _update_windows(self, x: np.ndarray) -> None:
+        if len(self._carry):
+            x = np.concatenate([self._carry, x])
+        n = len(x) // self._window
+        if n:
+            w = x[:n * self._window].reshape(n, self._window)
+            rms = np.sqrt(np.einsum("ij,ij->i", w, w) / self._window)
+            self.windows += n
+            self.silent_windows += int(np.count_nonzero(rms < SILENCE_RMS))
+        self._carry = x[n * self._window:].copy()
+
+    @property
+    def duration(self) -> float:
+        return self.frames / float(self.sample_rate) if self.sample_rate > 0 else 0.0
+
+    @property
+    def rms(self) -> float:
+        return (self.sum_squares / self.frames) ** 0.5 if self.frames else 0.0
+
+    @property
+    def clipping_ratio(self) -> float:
+        return self.clipped / self.frames if self.frames else 0.0
+
+    @property
+    def silence_ratio(self) -> float:
+        return self.silent_windows / self.windows if self.windows else 1.0
+
+    def check(
+        self,
+        expected_rate: Optional[int] = None,
+        min_duration: float = 0.05,
+        min_rms: float = 50.0,
+        max_clipping_ratio: float = 0.01,
+        max_silence_ratio: float = 0.95,
+    ) -> None:
+        """Levanta AssertionError se o áudio não for audível/bem formado."""
+        if expected_rate is not None:
+            assert self.sample_rate == expected_rate, f"Sample rate {self.sample_rate} != {expected_rate}"
+        assert self.duration >= min_duration, f"Duração muito curta: {self.duration:.3f}s (< {min_duration}s)"
+        assert self.rms >= min_rms, f"RMS muito baixo (provável silêncio): {self.rms:.2f} (< {min_rms})"
+        assert self.clipping_ratio <= max_clipping_ratio, f"Clipping excessivo: {self.clipping_ratio:.2%} das amostras"
+        assert self.silence_ratio <= max_silence_ratio, f"Silêncio excessivo: {self.silence_ratio:.2%} das janelas"
+
+    def to_dict(self) -> dict:
+        return {
+            "duration": round(self.duration, 3),
+            "rms": round(self.rms, 2),
+            "peak": self.peak,
+            "clipping_ratio": self.clipping_ratio,
+            "silence_ratio": self.silence_ratio,
+        }
+
+
+def buffer_stats(audio: np.ndarray, sample_rate: int) -> AudioStats:
+    """Estatísticas do buffer int16 em memória (antes de codificar; sem reler do disco)."""
+    stats = AudioStats(sample_rate)
+    stats.update(audio)
+    return stats
+
+
+def file_stats(path: str) -> AudioStats:
+    """Estatísticas de um arquivo lido em blocos (memória constante em arquivos longos)."""
+    info = sf.info(path)
+    stats = AudioStats(info.samplerate)
+    for block in sf.blocks(path, blocksize=BLOCK_FRAMES, dtype="int16", always_2d=True):
+        # Estéreo -> mono (média dos canais)
+        stats.update(block[:, 0] if block.shape[1] == 1 else block.mean(axis=1).astype(np.int16))
+    return stats
+
+
+def check_buffer(audio: np.ndarray, sample_rate: int, expected_rate: Optional[int] = None, **limits) -> AudioStats:
+    stats = buffer_stats(audio, sample_rate)
+    stats.check(expected_rate, **limits)
+    return stats
+
+
+def check_file(path: str, expected_rate: Optional[int] = None, min_size: int = 44, **limits) -> AudioStats:
+    assert os.path.exists(path), f"Arquivo inexistente: {path}"
+    size = os.path.getsize(path)
+    assert size > min_size, f"Arquivo sem dados (tamanho={size}): {path}"
+    stats = file_stats(path)
+    stats.check(expected_rate, **limits)
+    return stats
@@ -0,0 +1,287 @@
+import os
+import csv
+import json
+import time
+import hashlib
+import argparse
+from dataclasses import asdict, dataclass, replace
+from typing import TYPE_CHECKING, Callable, Iterator, Optional
+import pyarrow as pa
+import pyarrow.parquet as pq
+import soundfile as sf
+from dialogue_stream import prefetch
+from voice_catalog import find_voice
+
+# Gerador/pipeline (llama_cpp, Qdrant, embedder) só são importados no uso: com spawn, cada
+# worker do SynthesisScheduler reimporta este script como __mp_main__ e só precisa do Piper
+if TYPE_CHECKING:
+    from interview_generator import InterviewGenerator
+    from interview_pipeline import LanguageProfile, PipelineContext
+
+MANIFEST_NAME = "manifest.jsonl"
+
+
+@dataclass
+class BatchItem:
+    """Uma entrevista do lote: idioma × tema × especialista × modelo × par de vozes (ids do VOICE_CATALOG)."""
+    lang: str
+    topic: Optional[str] = None
+    specialist: Optional[str] = None
+    model: str = "fast"
+    sarah_voice: Optional[str] = None
+    leo_voice: Optional[str] = None
+    item_id: Optional[str] = None
+
+    def __post_init__(self):
+        from interview_pipeline import LANGUAGE_PROFILES
+        if self.lang not in LANGUAGE_PROFILES:
+            raise ValueError(f"Idioma não suportado no manifesto: {self.lang}")
+        for voice_id in (self.sarah_voice, self.leo_voice):
+            if voice_id and find_voice(voice_id) is None:
+                raise ValueError(f"Voz fora do VOICE_CATALOG no manifesto: {voice_id}")
+        if not self.item_id:
+            # Id estável: reexecutar o mesmo manifesto reconhece os itens já gerados
+            payload = json.dumps(
+                [self.lang, self.topic, self.specialist, self.model, self.sarah_voice, self.leo_voice],
+                ensure_ascii=False,
+            )
+            self.item_id = f"{self.lang}_{hashlib.sha1(payload.encode('utf-8')).hexdigest()[:12]}"
+
+    def profile(self) -> "LanguageProfile":
+        from interview_pipeline import LANGUAGE_PROFILES
+        base = LANGUAGE_PROFILES[self.lang]
+        return replace(
+            base,
+            sarah_voice=self.sarah_voice or base.sarah_voice,
+            leo_voice=self.leo_voice or base.leo_voice,
+            output_base=self.item_id,
+        )
+
+
+def _clean(value) -> Optional[str]:
+    """Células vazias (CSV) ou nulas (JSONL/Parquet) viram None."""
+    if value is None:
+        return None
+    value = str(value).strip()
+    return value or None
+
+
+def load_manifest(path: str, invalid: Optional[list[dict]] = None) -> list[BatchItem]:
+    """Lê o manifesto (.csv, .jsonl ou .parquet) com as colunas de `BatchItem` (só `lang` é obrigatória).
+
+    Com `invalid`, linhas inválidas (idioma ou voz desconhecidos) não abortam a leitura:
+    vão para essa lista como {colunas..., "error"} e o lote segue com as demais.
+    """
+    if path.endswith(".csv"):
+        with open(path, newline="", encoding="utf-8") as f:
+            rows = list(csv.DictReader(f))
+    elif path.endswith(".jsonl"):
+        with open(path, encoding="utf-8") as f:
+            rows = [json.loads(line) for line in f if line.strip()]
+    elif path.endswith(".parquet"):
+        rows = pq.read_table(path).to_pylist()
+    else:
+        raise ValueError(f"Formato de manifesto não suportado: {path} (use .csv, .jsonl ou .parquet)")
+    fields = BatchItem.__dataclass_fields__
+    items = []
+    for number, row in enumerate(rows, 1):
+        values = {k: _clean(v) for k, v in row.items() if k in fields}
+        values["model"] = values.get("model") or "fast"
+        try:
+            items.append(BatchItem(**values))
+        except (TypeError, ValueError) as e:
+            if invalid is None:
+                raise
+            invalid.append({
+                **{k: values.get(k) for k in fields},
+                "item_id": values.get("item_id") or f"row_{number}",
+                "error": str(e),
+            })
+    return items
+
+
+def read_results(output_dir: str) -> dict[str, dict]:
+    """Último registro de cada item no manifesto de saída (linhas de uma execução interrompida incluídas)."""
+    path = os.path.join(output_dir, MANIFEST_NAME)
+    results = {}
+    if not os.path.exists(path):
+        return results
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # última linha truncada por um crash
+            results[record["item_id"]] = record
+    return results
+
+
+class BatchRunner:
+    """Executa um manifesto de entrevistas com os modelos carregados uma única vez.
+
+    Os textos (generate → correct → parse) do próximo item são gerados em uma thread
+    enquanto o áudio do item atual é sintetizado e gravado (fila de `queue_size` itens).
+    Cada item concluído é anexado a `manifest.jsonl` no diretório de saída; ao rodar de
+    novo, os itens com status "ok" são pulados, então o lote pode ser retomado após um crash.
+    """
+
+    def __init__(
+        self,
+        output_dir: str,
+        queue_size: int = 2,
+        generator_factory: Optional[Callable[[str, Optional[str]], "InterviewGenerator"]] = None,
+        progress: Optional[Callable[[int, int], None]] = None,
+    ):
+        self.output_dir = output_dir
+        self.queue_size = max(1, queue_size)
+        self.generator_factory = generator_factory or _default_generator
+        self.progress = progress
+        self._generators: dict[tuple[str, Optional[str]], "InterviewGenerator"] = {}
+
+    def _generator(self, item: BatchItem) -> "InterviewGenerator":
+        key = (item.model, item.specialist)
+        if key not in self._generators:
+            self._generators[key] = self.generator_factory(item.model, item.specialist)
+        return self._generators[key]
+
+    def _texts(self, items: list[BatchItem]) -> Iterator[tuple[BatchItem, Optional["PipelineContext"], Optional[str]]]:
+        from interview_pipeline import TEXT_STAGES, InterviewPipeline, PipelineContext, voices_available
+        for item in items:
+            try:
+                profile = item.profile()
+                available = voices_available(profile)
+            except (KeyError, ValueError) as e:
+                yield item, None, str(e)
+                continue
+            if not available:
+                yield item, None, f"vozes não encontradas: {profile.sarah_voice}, {profile.leo_voice}"
+                continue
+            ctx = PipelineContext(
+                profile=profile,
+                generator=self._generator(item),
+                selected_topic=item.topic,
+                output_dir=self.output_dir,
+            )
+            try:
+                InterviewPipeline(TEXT_STAGES).run(ctx)
+            except Exception as e:
+                yield item, None, str(e)
+                continue
+            yield item, ctx, None
+
+    def _record(self, record: dict) -> None:
+        with open(os.path.join(self.output_dir, MANIFEST_NAME), "a", encoding="utf-8") as f:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def run(self, items: list[BatchItem], invalid: Optional[list[dict]] = None) -> dict:
+        """Gera os itens pendentes; `invalid` (linhas rejeitadas do manifesto) entra no manifest.jsonl como erro."""
+        from interview_pipeline import AUDIO_STAGES, InterviewPipeline
+        os.makedirs(self.output_dir, exist_ok=True)
+        recorded = read_results(self.output_dir)
+        for row in invalid or []:
+            print(f"Linha inválida no manifesto ({row['item_id']}): {row['error']}")
+            # Ao retomar o lote, a linha já registrada em uma execução anterior não é anexada de novo
+            if row["item_id"] not in recorded:
+                self._record({**row, "status": "error", "output_path": None, "duration_seconds": None, "sample_rate": None,
+                              "lines": 0, "timings": {}, "integrity": None, "finished_at": time.time()})
+        done_ids = {i for i, r in recorded.items() if r.get("status") == "ok"}
+        pending = [item for item in items if item.item_id not in done_ids]
+        skipped = len(items) - len(pending)
+        print(f"Lote: {len(items)} itens, {skipped} já concluídos, {len(pending)} a gerar")
+
+        finished = failed = 0
+        for item, ctx, error in prefetch(self._texts(pending), self.queue_size):
+            record = {**asdict(item), "status": "error", "output_path": None, "duration_seconds": None,
+                      "sample_rate": None, "lines": 0, "timings": {}, "integrity": None, "error": error}
+            if ctx is not None:
+                # Sobra de uma execução interrompida no meio da gravação
+                partial = os.path.join(self.output_dir, f"{item.item_id}.flac")
+                if os.path.exists(partial):
+                    os.remove(partial)
+                try:
+                    InterviewPipeline(AUDIO_STAGES).run(ctx)
+                    if ctx.output_path is None:
+                        raise RuntimeError("nenhum áudio gerado")
+                    record.update(
+                        status="ok",
+                        output_path=ctx.output_path,
+                        duration_seconds=ctx.integrity["duration"] if ctx.integrity else sf.info(ctx.output_path).duration,
+                        sample_rate=ctx.sample_rate,
+                        lines=len(ctx.lines),
+                        timings=ctx.timings,
+                        integrity=ctx.integrity,
+                        error=None,
+                    )
+                except Exception as e:
+                    record["error"] = str(e)
+            record["finished_at"] = time.time()
+            self._record(record)
+            finished += 1
+            failed += record["status"] != "ok"
+            print(f"[{skipped + finished}/{len(items)}] {item.item_id}: {record['status']}"
+                  + (f" ({record['error']})" if record["error"] else ""))
+            if self.progress is not None:
+                self.progress(skipped + finished, len(items))
+
+        manifest_parquet = self.write_parquet_manifest()
+        return {
+            "total": len(items) + len(invalid or []),
+            "skipped": skipped,
+            "generated": finished - failed,
+            "failed": failed + len(invalid or []),
+            "manifest": manifest_parquet,
+        }
+
+    def write_parquet_manifest(self) -> str:
+        """Consolida o manifest.jsonl (último registro por item) em manifest.parquet."""
+        rows = []
+        for record in read_results(self.output_dir).values():
+            rows.append({
+                **record,
+                "timings": json.dumps(record.get("timings") or {}),
+                "integrity": json.dumps(record.get("integrity") or {}),
+            })
+        path = os.path.join(self.output_dir, "manifest.parquet")
+        pq.write_table(pa.Table.from_pylist(rows), path)
+        return path
+
+
+def _default_generator(model: str, specialist: Optional[str]) -> "InterviewGenerator":
+    """Gerador do CLI; com especialista, todos compartilham o cliente Qdrant e o embedder do processo."""
+    from interview_generator import InterviewGeneratorBuilder
+    builder = InterviewGeneratorBuilder().set_model_type(model)
+    if specialist:
+        from embedder import get_embedder
+        from qdrant_store import get_qdrant_client
+        builder.set_specialist(specialist).set_qdrant(get_qdrant_client()).set_embedder(get_embedder())
+    return builder.build()
+
+
+def run_batch(
+    manifest_path: str,
+    output_dir: str,
+    queue_size: int = 2,
+    generator_factory: Optional[Callable[[str, Optional[str]], "InterviewGenerator"]] = None,
+    progress: Optional[Callable[[int, int], None]] = None,
+) -> dict:
+    invalid: list[dict] = []
+    items = load_manifest(manifest_path, invalid=invalid)
+    runner = BatchRunner(output_dir, queue_size=queue_size, generator_factory=generator_factory, progress=progress)
+    return runner.run(items, invalid=invalid)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate a batch of interviews from a manifest (CSV/JSONL/Parquet).")
+    parser.add_argument("manifest", help="Manifest with columns lang, topic, specialist, model, sarah_voice, leo_voice, item_id.")
+    parser.add_argument("--out", default=os.path.join("outputs", "batch"), help="Output directory (audio + manifest.jsonl/parquet).")
+    parser.add_argument("--queue", type=int, default=2, help="Interviews whose texts may be generated ahead of synthesis.")
+    args = parser.parse_args()
+    from qdrant_store import close_qdrant_client
+
+    summary = run_batch(args.manifest, args.out, queue_size=args.queue)
+    # Descarrega os diálogos ainda na fila do writer antes de sair
+    close_qdrant_client()
+    print(f"Lote concluído: {summary['generated']} gerados, {summary['skipped']} pulados, {summary['failed']} com erro")
+    print(f"Manifesto: {summary['manifest']}")
@@ -2,6 +2,7 @@ import os
 import json
 import pandas as pd
 import glob
+from voice_index import build_voice_index
 
 # Directory with models
 models_dir = 'models'
@@ -35,4 +36,8 @@ for json_file in json_files:
     print(f"Converted {json_file} to {parquet_file}")
 
     # Optionally, remove the JSON file
-    # os.remove(json_file)
\ No newline at end of file
+    # os.remove(json_file)
+
+# Índice consolidado (uma leitura para listar todas as vozes)
+index_path = build_voice_index(models_dir)
+print(f"Índice de vozes salvo em {index_path}")
@@ -0,0 +1,119 @@
+import os
+import re
+from functools import lru_cache
+from typing import Optional
+from llama_cpp import LlamaGrammar
+
+# Geração e stream do diálogo: trocas Sarah/Leo alternadas, uma fala por linha, sem
+# preâmbulo ("Corrected dialogue:") nem texto fora do formato. O número de trocas é
+# parâmetro: o mínimo padrão é 1, então o "12-16 trocas" do prompt segue como orientação
+# e uma saída cortada por max_tokens não obriga o modelo a inventar falas
+DIALOGUE_GBNF = r'''
+root ::= {repeat}
+exchange ::= "Sarah: " text "\n" "Leo: " text "\n"
+text ::= [^\n ] [^\n]*
+'''
+
+# Correção (two-pass): a sequência exata de falas do original (mesmos speakers, na mesma
+# ordem e quantidade); só o texto de cada fala pode mudar
+CORRECTION_GBNF = r'''
+root ::= {lines}
+text ::= [^\n ] [^\n]*
+'''
+
+# Uma única fala (reescrita de linha reprovada), sem prefixo de speaker
+LINE_GBNF = r'''
+root ::= [^\n ] [^\n]*
+'''
+
+# Sugestão de tópicos: JSON com exatamente 5 temas (response_format do llama.cpp)
+TOPICS_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "topics": {
+            "type": "array",
+            "items": {"type": "string", "minLength": 3},
+            "minItems": 5,
+            "maxItems": 5,
+        },
+    },
+    "required": ["topics"],
+}
+TOPICS_RESPONSE_FORMAT = {"type": "json_object", "schema": TOPICS_SCHEMA}
+
+MIN_WORDS = 3
+MAX_WORDS = 80
+MAX_CHARS = 500
+
+_SPEAKER_INSIDE = re.compile(r'\b(Sarah|Leo):')
+_MARKUP = re.compile(r'[*#`]|\[[^\]]*\]')
+_FINAL_PUNCT = re.compile(r'[.!?…"\')»]$')
+_REPEATED_WORD = re.compile(r'\b(\w+)\s+\1\b', re.IGNORECASE)
+
+
+def exchange_bounds() -> tuple[int, Optional[int]]:
+    """Limites de trocas da gramática de geração.
+
+    TTS_DIALOGUE_MIN_EXCHANGES (padrão 1) e TTS_DIALOGUE_MAX_EXCHANGES (padrão 16; 0 = sem teto).
+    """
+    low = max(1, int(os.environ.get("TTS_DIALOGUE_MIN_EXCHANGES", "1")))
+    high = int(os.environ.get("TTS_DIALOGUE_MAX_EXCHANGES", "16"))
+    return low, (max(low, high) if high > 0 else None)
+
+
+@lru_cache(maxsize=None)
+def dialogue_grammar(min_exchanges: Optional[int] = None, max_exchanges: Optional[int] = None) -> LlamaGrammar:
+    """Gramática de geração com `min_exchanges`..`max_exchanges` trocas (None = limites do ambiente)."""
+    if min_exchanges is None and max_exchanges is None:
+        min_exchanges, max_exchanges = exchange_bounds()
+    low = max(1, min_exchanges or 1)
+    repeat = f"exchange{{{low},{max_exchanges}}}" if max_exchanges else f"exchange{{{low},}}"
+    return LlamaGrammar.from_string(DIALOGUE_GBNF.replace("{repeat}", repeat), verbose=False)
+
+
+@lru_cache(maxsize=64)
+def correction_grammar(speakers: tuple[str, ...]) -> LlamaGrammar:
+    """Gramática da correção para um original com as falas de `speakers` ("Sarah"/"Leo", em ordem)."""
+    lines = " ".join(f'"{speaker}: " text "\\n"' for speaker in speakers)
+    return LlamaGrammar.from_string(CORRECTION_GBNF.replace("{lines}", lines), verbose=False)
+
+
+@lru_cache(maxsize=None)
+def line_grammar() -> LlamaGrammar:
+    return LlamaGrammar.from_string(LINE_GBNF, verbose=False)
+
+
+def validate_line(text: str, previous: Optional[str] = None, specialist: Optional[str] = None) -> list[str]:
+    """Checagens locais e baratas de uma fala; retorna os problemas encontrados (vazio = ok)."""
+    issues = []
+    words = text.split()
+    if len(words) < MIN_WORDS:
+        issues.append("too short, not a complete sentence")
+    if len(words) > MAX_WORDS or len(text) > MAX_CHARS:
+        issues.append("too long for a single spoken line")
+    if _SPEAKER_INSIDE.search(text):
+        issues.append("contains another speaker's line")
+    if _MARKUP.search(text):
+        issues.append("contains formatting or placeholders")
+    if words and not _FINAL_PUNCT.search(text):
+        issues.append("incomplete sentence, missing final punctuation")
+    if previous is not None and text.strip().casefold() == previous.strip().casefold():
+        issues.append("repeats the previous line")
+    if specialist == "grammar":
+        if text[:1].islower():
+            issues.append("does not start with a capital letter")
+        if "  " in text:
+            issues.append("double spaces")
+        if _REPEATED_WORD.search(text):
+            issues.append("repeated word")
+    return issues
+
+
+def validate_dialogue(lines: list[tuple[str, str]], specialist: Optional[str] = None) -> dict[int, list[str]]:
+    """Problemas por índice de linha (só as reprovadas)."""
+    failures = {}
+    for i, (_, text) in enumerate(lines):
+        issues = validate_line(text, lines[i - 1][1] if i else None, specialist)
+        if issues:
+            failures[i] = issues
+    return failures
@@ -0,0 +1,115 @@
+import os
+import re
+import queue
+import threading
+from typing import Iterable, Iterator, Optional, TypeVar
+
+T = TypeVar("T")
+
+_LINE_RE = re.compile(r'^(Sarah|Leo):\s*(.*)$')
+
+
+def parse_dialogue_line(line: str, index: int) -> tuple[str, str]:
+    """Separa o prefixo 'Sarah:'/'Leo:' do texto. A geração é restrita pela gramática do
+    diálogo, então o prefixo sempre existe; a alternância pela posição (começa com Sarah)
+    fica só para textos sem prefixo (ex: LLM injetado sem gramática)."""
+    m = _LINE_RE.match(line.strip())
+    if m:
+        return (m.group(1), m.group(2).strip())
+    return ('Sarah' if index % 2 == 0 else 'Leo', line.strip())
+
+
+class DialogueStreamParser:
+    """Parser incremental do diálogo: recebe os pedaços de texto do stream do LLM
+    e devolve cada (speaker, text) assim que a linha termina (mesma regra de
+    `parse_dialogue_line`, então o resultado é igual ao do parsing do texto completo)."""
+
+    def __init__(self):
+        self.text = ""  # texto bruto acumulado
+        self.count = 0
+        self._buffer = ""
+
+    def feed(self, chunk: str) -> list[tuple[str, str]]:
+        self.text += chunk
+        self._buffer += chunk
+        lines = []
+        while "\n" in self._buffer:
+            line, self._buffer = self._buffer.split("\n", 1)
+            if line.strip():
+                lines.append(parse_dialogue_line(line, self.count))
+                self.count += 1
+        return lines
+
+    def close(self) -> list[tuple[str, str]]:
+        """Emite a última linha (sem quebra de linha no final), se houver."""
+        line, self._buffer = self._buffer, ""
+        if not line.strip():
+            return []
+        parsed = parse_dialogue_line(line, self.count)
+        self.count += 1
+        return [parsed]
+
+
+_DONE = object()
+# Espera máxima pelo produtor quando o consumidor para antes do fim (ex: cliente desconectou)
+STOP_TIMEOUT = 0.5
+
+
+def prefetch(source: Iterable[T], maxsize: int = 4) -> Iterator[T]:
+    """Consome `source` em uma thread própria e entrega os itens por uma fila limitada.
+
+    O produtor (ex: decodificação do LLM) segue adiantado até `maxsize` itens enquanto
+    o consumidor (ex: síntese Piper) trabalha. Exceções do produtor são relançadas no
+    consumidor; se o consumidor parar antes do fim, o produtor é encerrado e `source`
+    é fechado (liberando o modelo reservado por ele). O consumidor não espera um `next()`
+    em andamento no produtor (leitura de token do LLM): a thread daemon termina sozinha
+    e fecha `source` assim que ele volta.
+    """
+    items: queue.Queue = queue.Queue(maxsize=max(1, maxsize))
+    stop = threading.Event()
+    error: list[BaseException] = []
+
+    def put(item) -> bool:
+        while not stop.is_set():
+            try:
+                items.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce() -> None:
+        iterator = iter(source)
+        try:
+            for item in iterator:
+                if not put(item):
+                    break
+        except BaseException as e:  # repassado ao consumidor
+            error.append(e)
+        finally:
+            close = getattr(iterator, "close", None)
+            if close is not None:
+                close()
+            put(_DONE)
+
+    thread = threading.Thread(target=produce, name="dialogue-prefetch", daemon=True)
+    thread.start()
+    try:
+        while True:
+            item = items.get()
+            if item is _DONE:
+                break
+            yield item
+        if error:
+            raise error[0]
+    finally:
+        stop.set()
+        # Um gerador em execução na outra thread não pode ser fechado daqui; esperar o
+        # `next()` atual (segundos no LLM) travaria quem fecha o stream
+        thread.join(timeout=STOP_TIMEOUT)
+
+
+def default_queue_size() -> Optional[int]:
+    """Tamanho da fila entre LLM e síntese (TTS_DIALOGUE_QUEUE, padrão 4; 0 desliga a sobreposição)."""
+    size = int(os.environ.get("TTS_DIALOGUE_QUEUE", "4"))
+    return size if size > 0 else None
@@ -0,0 +1,218 @@
+import os
+import platform
+import threading
+from collections import OrderedDict
+from typing import Optional, Sequence, Union
+from urllib.request import urlretrieve
+import numpy as np
+
+MODEL_NAME = "all-MiniLM-L6-v2"
+EMBEDDINGS_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "models", "embeddings", MODEL_NAME))
+HF_BASE = "https://huggingface.co/sentence-transformers/all-MiniLM-L6-v2/resolve/main/{file}"
+MAX_SEQ_LENGTH = 256  # mesmo limite do SentenceTransformer para o MiniLM
+
+
+# Versões int8 publicadas no repositório do modelo, usadas quando a quantização local
+# (onnxruntime.quantization, que depende do pacote `onnx`) não está disponível
+PREQUANTIZED_FILES = {
+    "x86_64": "onnx/model_quint8_avx2.onnx",
+    "AMD64": "onnx/model_quint8_avx2.onnx",
+    "aarch64": "onnx/model_qint8_arm64.onnx",
+    "arm64": "onnx/model_qint8_arm64.onnx",
+}
+
+
+def _download(remote: str, path: str) -> None:
+    print(f"Baixando {remote} ({MODEL_NAME})...")
+    try:
+        urlretrieve(HF_BASE.format(file=remote), path + ".part")
+        os.replace(path + ".part", path)
+    finally:
+        if os.path.exists(path + ".part"):
+            os.remove(path + ".part")
+
+
+def _onnx_files(model_dir: str) -> tuple[str, str]:
+    """(modelo .onnx float32, tokenizer.json) do MiniLM, baixados na primeira vez."""
+    os.makedirs(model_dir, exist_ok=True)
+    tokenizer_path = os.path.join(model_dir, "tokenizer.json")
+    model_path = os.path.join(model_dir, "model.onnx")
+    for path, remote in ((tokenizer_path, "tokenizer.json"), (model_path, "onnx/model.onnx")):
+        if not os.path.exists(path):
+            _download(remote, path)
+    return model_path, tokenizer_path
+
+
+def _quantized_model(model_dir: str, model_path: str) -> Optional[str]:
+    """Modelo int8: quantização dinâmica local ou, sem o pacote `onnx`, a versão pré-quantizada
+    do repositório. None se nenhuma das duas der certo (segue com o float32)."""
+    quantized_path = os.path.join(model_dir, "model_qint8.onnx")
+    if os.path.exists(quantized_path):
+        return quantized_path
+    try:
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+        quantize_dynamic(model_path, quantized_path + ".part", weight_type=QuantType.QInt8)
+        os.replace(quantized_path + ".part", quantized_path)
+        return quantized_path
+    except Exception as e:
+        if os.path.exists(quantized_path + ".part"):
+            os.remove(quantized_path + ".part")
+        print(f"Aviso: quantização local do embedder indisponível ({e})")
+    remote = PREQUANTIZED_FILES.get(platform.machine())
+    if remote is None:
+        return None
+    try:
+        _download(remote, quantized_path)
+        return quantized_path
+    except Exception as e:
+        print(f"Aviso: falha ao baixar o embedder int8 pré-quantizado ({e})")
+        return None
+
+
+class _OnnxBackend:
+    """MiniLM no onnxruntime + tokenizers (sem PyTorch): mean pooling e normalização L2,
+    como os módulos Pooling/Normalize do SentenceTransformer."""
+
+    name = "onnx"
+
+    def __init__(self, model_path: str, tokenizer_path: str, name: str = "onnx"):
+        import onnxruntime
+        from tokenizers import Tokenizer
+
+        self.name = name
+        self.tokenizer = Tokenizer.from_file(tokenizer_path)
+        self.tokenizer.enable_truncation(max_length=MAX_SEQ_LENGTH)
+        self.tokenizer.enable_padding(pad_id=0, pad_token="[PAD]")
+        options = onnxruntime.SessionOptions()
+        threads = int(os.environ.get("TTS_ONNX_THREADS", "0"))
+        if threads > 0:
+            options.intra_op_num_threads = threads
+        self.session = onnxruntime.InferenceSession(model_path, sess_options=options, providers=["CPUExecutionProvider"])
+        self.input_names = {i.name for i in self.session.get_inputs()}
+
+    def encode(self, texts: list[str]) -> np.ndarray:
+        encodings = self.tokenizer.encode_batch(texts)
+        input_ids = np.array([e.ids for e in encodings], dtype=np.int64)
+        attention_mask = np.array([e.attention_mask for e in encodings], dtype=np.int64)
+        feeds = {"input_ids": input_ids, "attention_mask": attention_mask}
+        if "token_type_ids" in self.input_names:
+            feeds["token_type_ids"] = np.array([e.type_ids for e in encodings], dtype=np.int64)
+        hidden = self.session.run(None, feeds)[0]
+        mask = attention_mask[..., None].astype(np.float32)
+        pooled = (hidden * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+        norms = np.linalg.norm(pooled, axis=1, keepdims=True)
+        return (pooled / np.clip(norms, 1e-12, None)).astype(np.float32)
+
+
+class _TorchBackend:
+    """Fallback com sentence-transformers (PyTorch), para quando o ONNX não está disponível."""
+
+    name = "torch"
+
+    def __init__(self):
+        from sentence_transformers import SentenceTransformer
+        self.model = SentenceTransformer(MODEL_NAME)
+
+    def encode(self, texts: list[str]) -> np.ndarray:
+        return np.asarray(self.model.encode(texts, batch_size=len(texts)), dtype=np.float32)
+
+
+class Embedder:
+    """Embeddings do MiniLM compartilhados pelo processo, com cache LRU texto → vetor.
+
+    `encode` segue a interface do SentenceTransformer: uma string devolve um vetor
+    1-D, uma lista devolve uma matriz. Só os textos fora do cache vão ao modelo,
+    em lotes de `batch_size`.
+    """
+
+    def __init__(self, backend: str = "auto", cache_size: int = 2048, quantize: bool = True, model_dir: str = EMBEDDINGS_DIR):
+        self.backend = self._load_backend(backend, quantize, model_dir)
+        print(f"Embedder {MODEL_NAME}: backend {self.backend.name}")
+        self.cache_size = cache_size
+        self._cache: OrderedDict[str, np.ndarray] = OrderedDict()
+        self._lock = threading.Lock()
+        self._encode_lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _load_backend(backend: str, quantize: bool, model_dir: str):
+        """ONNX int8 → ONNX float32 → sentence-transformers; o PyTorch só entra se nenhum ONNX carregar."""
+        if backend in ("auto", "onnx"):
+            try:
+                model_path, tokenizer_path = _onnx_files(model_dir)
+                candidates = []
+                if quantize:
+                    quantized_path = _quantized_model(model_dir, model_path)
+                    if quantized_path is not None:
+                        candidates.append((quantized_path, "onnx-int8"))
+                candidates.append((model_path, "onnx"))
+                for path, name in candidates:
+                    try:
+                        return _OnnxBackend(path, tokenizer_path, name)
+                    except Exception as e:
+                        error = e
+                        print(f"Aviso: falha ao carregar o embedder {name} ({e})")
+                raise error
+            except Exception as e:
+                if backend == "onnx":
+                    raise
+                print(f"Aviso: embedder ONNX indisponível ({e}); usando sentence-transformers")
+        return _TorchBackend()
+
+    def encode(self, texts: Union[str, Sequence[str]], batch_size: int = 32, **_) -> np.ndarray:
+        single = isinstance(texts, str)
+        texts = [texts] if single else list(texts)
+        vectors: list[Optional[np.ndarray]] = [None] * len(texts)
+        missing: dict[str, list[int]] = {}
+        with self._lock:
+            for i, text in enumerate(texts):
+                cached = self._cache.get(text)
+                if cached is not None:
+                    self._cache.move_to_end(text)
+                    vectors[i] = cached
+                    self.hits += 1
+                else:
+                    missing.setdefault(text, []).append(i)
+                    self.misses += 1
+        pending = list(missing)
+        for start in range(0, len(pending), max(1, batch_size)):
+            chunk = pending[start:start + max(1, batch_size)]
+            # Sessão/modelo compartilhados: uma inferência por vez
+            with self._encode_lock:
+                encoded = self.backend.encode(chunk)
+            with self._lock:
+                for text, vector in zip(chunk, encoded):
+                    for i in missing[text]:
+                        vectors[i] = vector
+                    if self.cache_size > 0:
+                        self._cache[text] = vector
+                        self._cache.move_to_end(text)
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+        result = np.stack(vectors) if vectors else np.zeros((0, 384), dtype=np.float32)
+        return result[0] if single else result
+
+    def stats(self) -> dict:
+        return {"backend": self.backend.name, "cached": len(self._cache), "hits": self.hits, "misses": self.misses}
+
+
+_EMBEDDER: Optional[Embedder] = None
+_EMBEDDER_LOCK = threading.Lock()
+
+
+def get_embedder() -> Embedder:
+    """Embedder único do processo.
+
+    TTS_EMBEDDER_BACKEND: auto (ONNX, com fallback para PyTorch), onnx ou torch;
+    TTS_EMBEDDER_QUANTIZE: 1 (int8, padrão) ou 0; TTS_EMBEDDER_CACHE: entradas do LRU (padrão 2048; 0 desliga).
+    """
+    global _EMBEDDER
+    with _EMBEDDER_LOCK:
+        if _EMBEDDER is None:
+            _EMBEDDER = Embedder(
+                backend=os.environ.get("TTS_EMBEDDER_BACKEND", "auto"),
+                cache_size=int(os.environ.get("TTS_EMBEDDER_CACHE", "2048")),
+                quantize=os.environ.get("TTS_EMBEDDER_QUANTIZE", "1") == "1",
+            )
+        return _EMBEDDER
@@ -2,11 +2,36 @@ from llama_cpp import Llama
 import re
 import sys
 import os
-import atexit
+import json
+import time
 from uuid import uuid4
-from typing import Optional
+from typing import Iterator, Optional
 from qdrant_client import QdrantClient
-from sentence_transformers import SentenceTransformer
+from embedder import Embedder, get_embedder
+from interview_prompts import INTERVIEW_PROMPTS
+from qdrant_store import edit_stats, get_qdrant_client, line_diff, pair_id_for
+from qdrant_writer import get_qdrant_writer
+from model_manager import get_model_manager, state_bytes
+from llm_budget import TASK_MAX_TOKENS, fit_max_tokens
+from topic_cache import get_topic_cache
+from dialogue_stream import DialogueStreamParser, parse_dialogue_line
+from dialogue_grammar import (
+    TOPICS_RESPONSE_FORMAT,
+    correction_grammar,
+    dialogue_grammar,
+    line_grammar,
+    validate_dialogue,
+)
+
+# Modos de correção dos especialistas grammar/daily:
+# "two-pass": segunda chamada reescreve o diálogo inteiro;
+# "fused": restrições na própria geração (com gramática GBNF) + validador local,
+# chamando o LLM de novo só para as linhas reprovadas.
+CORRECTION_MODES = ("two-pass", "fused")
+
+# Tarefas com prefixo fixo aquecido no cache de prompts (geração padrão, geração daily,
+# correção — two-pass ou line_fix no fused — e tópicos)
+WARM_TASKS = ("generate", "daily", "correct", "topics")
 
 
 class InterviewGeneratorBuilder:
@@ -15,6 +40,10 @@ class InterviewGeneratorBuilder:
     def __init__(self):
         self.model_type = "fast"
         self.specialist = None
+        self.llm = None
+        self.qdrant = None
+        self.embedder = None
+        self.correction_mode = None
     
     def set_model_type(self, model_type: str):
         self.model_type = model_type
@@ -24,220 +53,289 @@ class InterviewGeneratorBuilder:
         self.specialist = specialist
         return self
     
+    def set_llm(self, llm: Llama):
+        """Reutiliza uma instância Llama já carregada (evita recarregar o GGUF)."""
+        self.llm = llm
+        return self
+
+    def set_qdrant(self, qdrant: QdrantClient):
+        self.qdrant = qdrant
+        return self
+
+    def set_embedder(self, embedder: Embedder):
+        self.embedder = embedder
+        return self
+
+    def set_correction_mode(self, mode: str):
+        self.correction_mode = mode
+        return self
+
     def build(self):
-        return InterviewGenerator(self.model_type, self.specialist)
+        return InterviewGenerator(
+            self.model_type, self.specialist, self.llm, self.qdrant, self.embedder, self.correction_mode
+        )
 
 
 class InterviewGenerator:
     """Gerador de entrevistas técnica utilizando modelos GGUF (Llama/Qwen)."""
 
-    def __init__(self, model_type: str = "fast", specialist: Optional[str] = None):
-        # Mapeamento de tipos para caminhos de modelos
-        model_paths = {
-            "fast": "models/Qwen2.5-1.5B-Instruct-Q4_K_M.gguf",  # Modelo menor, mais rápido
-            "reasoning": "models/Llama-3.2-3B-Instruct-Q4_K_M.gguf",  # Modelo maior, melhor raciocínio
-        }
-        
-        model_path = model_paths.get(model_type, model_paths["fast"])
-        if not os.path.exists(model_path):
-            raise FileNotFoundError(f"Modelo não encontrado: {model_path}")
-        
-        # Aumenta n_ctx para reduzir avisos e suportar prompts maiores
-        n_ctx_map = {"fast": 16384, "reasoning": 32768}
-        
-        # Configuração para CPU: n_threads deve ser o número de núcleos físicos do seu PC
-        self.llm = Llama(
-            model_path=model_path,
-            n_ctx=n_ctx_map.get(model_type, 8192),  # Ajuste conforme modelo
-            n_threads=3,      # Ajuste conforme seu processador
-            verbose=False     # Desativa logs pesados do C++
-        )
-        
+    def __init__(
+        self,
+        model_type: str = "fast",
+        specialist: Optional[str] = None,
+        llm: Optional[Llama] = None,
+        qdrant: Optional[QdrantClient] = None,
+        embedder: Optional[Embedder] = None,
+        correction_mode: Optional[str] = None,
+    ):
+        # Modelos GGUF vêm do gerenciador compartilhado (carregados uma vez por processo);
+        # `llm` permite injetar uma instância própria
+        self.model_type = model_type
+        self.llm = llm
         self.specialist = specialist
+        mode = correction_mode or os.environ.get("TTS_CORRECTION_MODE", "two-pass")
+        self.correction_mode = mode if mode in CORRECTION_MODES else "two-pass"
         
-        # Qdrant/Embedder serão inicializados sob demanda para evitar downloads desnecessários
-        self.qdrant = None
-        self.embedder = None
-        
-        # Registrar fechamento gracioso para evitar erro no shutdown
-        atexit.register(self._close_qdrant)
+        # Qdrant/Embedder serão inicializados sob demanda para evitar downloads desnecessários;
+        # sem injeção, usam os compartilhados do processo (fechados pelo atexit do qdrant_store)
+        self.qdrant = qdrant
+        self.embedder = embedder
 
-    def suggest_topics(self, subject: str, target_lang: str = "en") -> list[str]:
-        """Sugere 5 tópicos em Português (PT-BR) para uma conversa que será gerada em inglês ou espanhol."""
-        lang_label = "Inglês" if target_lang == "en" else "Espanhol"
+    @staticmethod
+    def _fit_to_context(llm: Llama, kwargs: dict) -> dict:
+        """Ajusta max_tokens ao n_ctx carregado (o contexto agora é dimensionado pelas tarefas)."""
+        if "max_tokens" not in kwargs:
+            return kwargs
+        text = "\n".join(m["content"] for m in kwargs.get("messages", []))
+        # ~8 tokens por mensagem para o template de chat
+        prompt_tokens = len(llm.tokenize(text.encode("utf-8"), add_bos=False)) + 8 * len(kwargs.get("messages", []))
+        return {**kwargs, "max_tokens": fit_max_tokens(prompt_tokens, kwargs["max_tokens"], llm.n_ctx())}
+
+    def _complete(self, **kwargs) -> dict:
+        """create_chat_completion com uso exclusivo do modelo (gerenciador ou instância injetada)."""
+        if self.llm is not None:
+            return self.llm.create_chat_completion(**self._fit_to_context(self.llm, kwargs))
+        with get_model_manager().lease(self.model_type) as llm:
+            return llm.create_chat_completion(**self._fit_to_context(llm, kwargs))
+
+    def _complete_stream(self, **kwargs) -> Iterator[dict]:
+        """Versão stream=True: o modelo fica reservado até o fim da iteração."""
+        if self.llm is not None:
+            yield from self.llm.create_chat_completion(stream=True, **self._fit_to_context(self.llm, kwargs))
+            return
+        with get_model_manager().lease(self.model_type) as llm:
+            yield from llm.create_chat_completion(stream=True, **self._fit_to_context(llm, kwargs))
+
+    @staticmethod
+    def topics_messages(subject: str, target_lang: str = "en") -> list[dict]:
+        """Mensagens da sugestão de tópicos (o system prompt depende só do idioma)."""
+        lang_label = INTERVIEW_PROMPTS.get(target_lang, INTERVIEW_PROMPTS["en"])["label"]
         sys_prompt = (
             "Você sugere temas de conversa para uma entrevista com base em um assunto. "
             f"A conversa será em {lang_label}. "
-            "Responda em Português do Brasil e retorne apenas uma lista numerada com 5 opções de tema, curtas e objetivas, sem comentários extras."
+            "Responda em Português do Brasil com um JSON {\"topics\": [...]} contendo 5 opções de tema, curtas e objetivas."
         )
-        messages = [
+        return [
             {"role": "system", "content": sys_prompt},
             {"role": "user", "content": f"Assunto: {subject}"},
         ]
-        out = self.llm.create_chat_completion(messages=messages, max_tokens=256, temperature=0.4)
-        txt = out["choices"][0]["message"]["content"].strip()
-        lines = [ln.strip() for ln in txt.split('\n') if ln.strip()]
+
+    def suggest_topics(self, subject: str, target_lang: str = "en") -> list[str]:
+        """Sugere 5 tópicos em Português (PT-BR) para uma conversa que será gerada no idioma `target_lang`.
+
+        Consulta antes o cache de tópicos; com embedder carregado, assuntos
+        semanticamente iguais ("SQL" / "banco de dados SQL") também acertam.
+        """
+        cache = get_topic_cache()
+        embedding = None
+        if cache is not None:
+            if self.embedder is not None and cache.similarity > 0:
+                embedding = self.embedder.encode(subject)
+            cached = cache.get(subject, target_lang, self.model_type, self.specialist, embedding)
+            if cached is not None:
+                return cached
+
+        messages = self.topics_messages(subject, target_lang)
+        out = self._complete(
+            messages=messages,
+            max_tokens=TASK_MAX_TOKENS["topics"],
+            temperature=0.4,
+            response_format=TOPICS_RESPONSE_FORMAT,  # saída restrita ao schema: sem numeração nem comentários
+        )
+        topics = self._parse_topics(out["choices"][0]["message"]["content"])
+        # Lista incompleta (saída truncada) não vai para o cache
+        if cache is not None and len(topics) == 5:
+            cache.put(subject, target_lang, self.model_type, self.specialist, topics, embedding)
+        return topics
+
+    @staticmethod
+    def _parse_topics(content: str) -> list[str]:
+        """Temas do JSON do schema; se a saída vier truncada (max_tokens) ou fora do schema,
+        aproveita as strings entre aspas ou, por fim, as linhas (como antes do schema)."""
+        try:
+            topics = json.loads(content)["topics"]
+            return [t.strip() for t in topics if isinstance(t, str) and t.strip()][:5]
+        except (json.JSONDecodeError, KeyError, TypeError):
+            pass
+        quoted = [t.strip() for t in re.findall(r'"([^"\n]{3,})"', content) if t.strip() != "topics"]
+        if quoted or content.lstrip().startswith("{"):
+            return quoted[:5]
+        lines = [ln.strip() for ln in content.split('\n') if ln.strip()]
         # Remover numeração/traço e retornar lista simples
         topics = [re.sub(r'^\d+\.|^-\s*', '', ln).strip() for ln in lines]
-        return topics[:5]
+        return [t for t in topics if t][:5]
 
-    def generate_english_interview_texts(self, selected_topic: str | None = None) -> list[tuple[str, str]]:
-        # Primeiro, gerar diálogo base
-        if self.specialist == "daily":
-            sys_prompt = (
-                "You are a casual interviewer in an everyday setting. Generate a relaxed, informal dialogue between Sarah (Interviewer) and Leo (Backend Candidate). "
-                "Use everyday language, slang, common expressions, and informal terms. Make it sound like a natural conversation, not a formal interview. "
-                "Topics: REST APIs, SQL, Docker, and Debugging, but discuss them in a laid-back way. "
-                "Generate at least 12-16 dialogue exchanges (24-32 lines total) to create a substantial conversation. "
-                "Format: Return ONLY the dialogue lines, one per line, prefixed with the speaker name: \"Sarah: [text]\" or \"Leo: [text]\". "
-                "Start with Sarah, then alternate speakers logically."
-            )
-        else:
-            sys_prompt = (
-                "You are a technical recruiter. Generate a dialogue between Sarah (Interviewer) and Leo (Backend Candidate). "
-                "Topics: REST APIs, SQL, Docker, and Debugging. "
-                "Generate at least 12-16 dialogue exchanges (24-32 lines total) to create a complete interview. "
-                "Format: Return ONLY the dialogue lines, one per line, prefixed with the speaker name: \"Sarah: [text]\" or \"Leo: [text]\". "
-                "Start with Sarah, then alternate speakers logically."
-            )
-        messages = [
-            {
-                "role": "system",
-                "content": sys_prompt
-            },
-            {"role": "user", "content": (
-                f"Generate the interview now. Focus on the theme: {selected_topic}." if selected_topic else "Generate the interview now."
-            )}
+    def build_messages(self, lang: str = "en", selected_topic: str | None = None) -> list[dict]:
+        """Mensagens (system + user) da geração do diálogo no idioma informado."""
+        prompts = INTERVIEW_PROMPTS[lang]
+        sys_prompt = prompts["daily"] if self.specialist == "daily" else prompts["default"]
+        if self.fused_correction():
+            sys_prompt += prompts["fused"][self.specialist]
+        user_prompt = prompts["user_topic"].format(topic=selected_topic) if selected_topic else prompts["user"]
+        return [
+            {"role": "system", "content": sys_prompt},
+            {"role": "user", "content": user_prompt},
         ]
 
-        output = self.llm.create_chat_completion(
-            messages=messages,
-            max_tokens=2500,
-            temperature=0.7
+    def generate_raw(self, lang: str = "en", selected_topic: str | None = None) -> str:
+        """Etapa de geração: diálogo base, restrito pela gramática às linhas Sarah/Leo alternadas."""
+        output = self._complete(
+            messages=self.build_messages(lang, selected_topic),
+            max_tokens=TASK_MAX_TOKENS["generate"],
+            temperature=0.7,
+            grammar=dialogue_grammar(),
         )
-
         raw_text = output["choices"][0]["message"]["content"]
-        
         # Salvar generated no Qdrant quando especialista for selecionado
         if self.specialist:
-            self._save_to_qdrant("generated", raw_text)
-        
-        # Se especialista em gramática, corrigir sequencialmente
-        if self.specialist in ("grammar", "daily"):
-            correction_messages = [
-                {
-                    "role": "system",
-                    "content": (
-                        "You are an expert reviewer. Ensure the dialogue has a clear logical order: greeting, background, REST APIs, scalability/design, SQL optimization, Docker usage, debugging example, final wrap-up. "
-                        "Ensure speakers alternate starting with Sarah, and every line is prefixed with 'Sarah:' or 'Leo:'. "
-                        "If grammar specialist: correct grammar to standard formal English. If daily specialist: keep language natural and conversational. "
-                        "IMPORTANT: Preserve the dialogue length. Do NOT shorten or summarize. Keep ALL exchanges from the original. "
-                        "Keep the original meaning; do not add extra topics; maintain the number of lines."
-                    )
-                },
-                {"role": "user", "content": f"Correct this dialogue:\n{raw_text}"}
-            ]
-            correction_output = self.llm.create_chat_completion(
-                messages=correction_messages,
-                max_tokens=2000,
-                temperature=0.3  # Menos criatividade para correção/validação
-            )
-            corrected_text = correction_output["choices"][0]["message"]["content"]
-            # Limpar artefatos indesejados
-            corrected_text = re.sub(r'^Corrected dialogue:\s*\n?', '', corrected_text).strip()
-            # Salvar corrected
-            self._save_to_qdrant("corrected", corrected_text)
-            raw_text = corrected_text
-        
-        print(f"Raw text (tokens aproximados): {len(raw_text.split())}")
-        structured = self._parse_dialogue_structured(raw_text)
-        joined = ' '.join([t for _, t in structured])
-        print(f"Parsed texts (linhas): {len(structured)}, tokens aproximados: {len(joined.split())}")
-        print(f"Tokens removidos: {len(raw_text.split()) - len(joined.split())}")
-        return structured
+            self._save_to_qdrant("generated", raw_text, lang, pair_id_for(raw_text), selected_topic)
+        return raw_text
 
-    def _parse_dialogue_structured(self, text: str) -> list[tuple[str, str]]:
-        """Retorna lista de tuplas (speaker, text), garantindo alternância lógica se ausente."""
-        lines = [ln for ln in text.strip().split('\n') if ln.strip()]
-        result: list[tuple[str, str]] = []
-        for ln in lines:
-            m = re.match(r'^(Sarah|Leo):\s*(.*)$', ln.strip())
-            if m:
-                speaker, content = m.group(1), m.group(2).strip()
-                result.append((speaker, content))
-            else:
-                # Sem prefixo, aplicar alternância: começa com Sarah
-                speaker = 'Sarah' if len(result) % 2 == 0 else 'Leo'
-                result.append((speaker, ln.strip()))
-        # Garantir alternância simples
-        fixed: list[tuple[str, str]] = []
-        for i, (spk, content) in enumerate(result):
-            expected = 'Sarah' if i % 2 == 0 else 'Leo'
-            fixed.append((expected, content))
-        return fixed
+    def needs_correction(self) -> bool:
+        return self.specialist in ("grammar", "daily")
 
-    def generate_spanish_interview_texts(self, selected_topic: str | None = None) -> list[tuple[str, str]]:
-        """Gera diálogo em espanhol, mantendo nomes 'Sarah' e 'Leo' para mapear vozes."""
-        if self.specialist == "daily":
-            sys_prompt = (
-                "Eres un entrevistador casual en un entorno cotidiano. Genera un diálogo relajado e informal entre Sarah (Entrevistadora) y Leo (Candidato Backend). "
-                "Usa lenguaje cotidiano, jerga, expresiones comunes y términos informales. Haz que suene como una conversación natural, no una entrevista formal. "
-                "Temas: APIs REST, SQL, Docker y Depuración, pero discútelos de manera relajada. "
-                "Genera al menos 12-16 intercambios de diálogo (24-32 líneas en total) para crear una conversación sustancial. "
-                "Formato: Devuelve SOLO las líneas del diálogo, cada una con el nombre del hablante: 'Sarah: [texto]' o 'Leo: [texto]'. "
-                "Empieza con Sarah y alterna de forma lógica."
+    def fused_correction(self) -> bool:
+        return self.needs_correction() and self.correction_mode == "fused"
+
+    def correct(self, lang: str, raw_text: str, selected_topic: Optional[str] = None) -> str:
+        """Etapa de correção (especialistas grammar/daily): revisa o diálogo inteiro em uma segunda chamada,
+        ou, no modo "fused", só reescreve as linhas reprovadas pelo validador local."""
+        if not self.needs_correction():
+            return raw_text
+        if self.fused_correction():
+            corrected_text = self.repair_lines(lang, raw_text)
+            self._save_corrected(lang, raw_text, corrected_text, selected_topic)
+            return corrected_text
+        speakers = tuple(speaker for speaker, _ in self._parse_dialogue_structured(raw_text))
+        if not speakers:
+            return raw_text
+        correction_messages = self.correction_messages(lang, raw_text)
+        correction_output = self._complete(
+            messages=correction_messages,
+            max_tokens=TASK_MAX_TOKENS["correct"],
+            temperature=0.3,  # Menos criatividade para correção/validação
+            grammar=correction_grammar(speakers),  # mesmas falas do original, na mesma ordem
+        )
+        corrected_text = correction_output["choices"][0]["message"]["content"].strip()
+        corrected_speakers = tuple(speaker for speaker, _ in self._parse_dialogue_structured(corrected_text))
+        if corrected_speakers != speakers:
+            # Saída cortada por max_tokens antes da última fala: segue com o diálogo sem correção
+            print(f"Aviso: correção com {len(corrected_speakers)} de {len(speakers)} falas; usando o diálogo original")
+            return raw_text
+        # Salvar corrected
+        self._save_corrected(lang, raw_text, corrected_text, selected_topic)
+        return corrected_text
+
+    def repair_lines(self, lang: str, raw_text: str) -> str:
+        """Valida cada fala localmente e pede ao LLM uma nova versão apenas das reprovadas
+        (com a linha anterior e a seguinte como contexto)."""
+        prompts = INTERVIEW_PROMPTS[lang]
+        lines = self._parse_dialogue_structured(raw_text)
+        failures = validate_dialogue(lines, self.specialist)
+        for index, issues in failures.items():
+            speaker, text = lines[index]
+            user = prompts["line_fix_user"].format(
+                prev=lines[index - 1][1] if index else "-",
+                speaker=speaker,
+                text=text,
+                issues="; ".join(issues),
+                next=lines[index + 1][1] if index + 1 < len(lines) else "-",
             )
-        else:
-            sys_prompt = (
-                "Eres un reclutador técnico. Genera un diálogo entre Sarah (Entrevistadora) y Leo (Candidato Backend). "
-                "Temas: APIs REST, SQL, Docker y Depuración. "
-                "Genera al menos 12-16 intercambios de diálogo (24-32 líneas en total) para crear una entrevista completa. "
-                "Formato: Devuelve SOLO las líneas del diálogo, cada una con el nombre del hablante: 'Sarah: [texto]' o 'Leo: [texto]'. "
-                "Empieza con Sarah y alterna de forma lógica."
+            output = self._complete(
+                messages=[{"role": "system", "content": prompts["line_fix"]}, {"role": "user", "content": user}],
+                max_tokens=TASK_MAX_TOKENS["line_fix"],
+                temperature=0.3,
+                grammar=line_grammar(),
             )
-        messages = [
-            {
-                "role": "system",
-                "content": sys_prompt
-            },
-            {"role": "user", "content": (
-                f"Genera la entrevista ahora. Enfócate en el tema: {selected_topic}." if selected_topic else "Genera la entrevista ahora."
-            )}
+            fixed = output["choices"][0]["message"]["content"].strip()
+            if fixed:
+                lines[index] = (speaker, fixed)
+        print(f"Correção fused: {len(failures)} de {len(lines)} linhas reescritas")
+        return "\n".join(f"{speaker}: {text}" for speaker, text in lines)
+
+    @staticmethod
+    def correction_messages(lang: str, raw_text: str) -> list[dict]:
+        prompts = INTERVIEW_PROMPTS[lang]
+        return [
+            {"role": "system", "content": prompts["correction"]},
+            {"role": "user", "content": prompts["correction_user"].format(text=raw_text)}
         ]
-        out = self.llm.create_chat_completion(messages=messages, max_tokens=2500, temperature=0.7)
-        raw_text = out["choices"][0]["message"]["content"]
-        
-        # Salvar generated no Qdrant quando especialista for selecionado
-        if self.specialist:
-            self._save_to_qdrant("generated", raw_text)
-        
-        # Se especialista em gramática, corrigir sequencialmente
-        if self.specialist in ("grammar", "daily"):
-            correction_messages = [
-                {
-                    "role": "system",
-                    "content": (
-                        "Eres un revisor experto. Asegúrate de que el diálogo tenga un orden lógico claro: saludo, antecedentes, APIs REST, escalabilidad/diseño, optimización SQL, uso de Docker, ejemplo de depuración, cierre final. "
-                        "Asegúrate de que los hablantes alternen empezando con Sarah, y cada línea esté prefijada con 'Sarah:' o 'Leo:'. "
-                        "Si especialista en gramática: corrige la gramática a español estándar formal. Si especialista diario: mantén el lenguaje natural y conversacional. "
-                        "IMPORTANTE: Preserva la longitud del diálogo. NO acortes ni resumas. Mantén TODOS los intercambios del original. "
-                        "Mantén el significado original; no agregues temas extra; mantén el número de líneas."
-                    )
-                },
-                {"role": "user", "content": f"Corrige este diálogo:\n{raw_text}"}
-            ]
-            correction_output = self.llm.create_chat_completion(
-                messages=correction_messages,
-                max_tokens=2000,
-                temperature=0.3  # Menos creatividad para correção/validação
+
+    def prompt_prefixes(self, lang: str, tasks: tuple[str, ...] = WARM_TASKS) -> list[list[dict]]:
+        """Prefixos fixos (system prompt + turno do usuário sem variáveis) das tarefas pedidas,
+        no formato que o modo de correção configurado realmente envia."""
+        prompts = INTERVIEW_PROMPTS[lang]
+        fused = self.correction_mode == "fused"
+
+        def with_system(content: str, user: str = prompts["user"]) -> list[dict]:
+            return [{"role": "system", "content": content}, {"role": "user", "content": user}]
+
+        prefixes = []
+        if "generate" in tasks:
+            prefixes.append(with_system(prompts["default"]))
+            if fused:
+                # Geração do especialista grammar com as restrições do revisor (build_messages)
+                prefixes.append(with_system(prompts["default"] + prompts["fused"]["grammar"]))
+        if "daily" in tasks:
+            daily = prompts["daily"] + (prompts["fused"]["daily"] if fused else "")
+            prefixes.append(with_system(daily))
+        if "correct" in tasks:
+            prefixes.append(with_system(prompts["line_fix"], "") if fused else self.correction_messages(lang, ""))
+        if "topics" in tasks:
+            prefixes.append(self.topics_messages("", lang))
+        return prefixes
+
+    def warm_prompt_cache(self, langs: Optional[list[str]] = None, tasks: tuple[str, ...] = WARM_TASKS) -> int:
+        """Avalia uma vez cada prefixo fixo das tarefas/idiomas configurados para que o cache
+        de estado do llama.cpp guarde o KV; nas chamadas seguintes só o turno do usuário é
+        processado. Retorna quantos prefixos continuam no cache depois do aquecimento."""
+        langs = list(INTERVIEW_PROMPTS) if langs is None else langs
+        prefixes = [messages for lang in langs for messages in self.prompt_prefixes(lang, tasks)]
+        for messages in prefixes:
+            self._complete(messages=messages, max_tokens=1, temperature=0.0)
+        if self.llm is not None:
+            return self._cached_prefixes(self.llm, len(prefixes))
+        with get_model_manager().lease(self.model_type) as llm:
+            return self._cached_prefixes(llm, len(prefixes))
+
+    @staticmethod
+    def _cached_prefixes(llm: Llama, warmed: int) -> int:
+        """Quantos estados ficaram no cache de RAM; avisa se o limite não comporta os prefixos aquecidos."""
+        states = getattr(getattr(llm, "cache", None), "cache_state", None)
+        if states is None:
+            return warmed
+        if len(states) < warmed:
+            largest = max((state_bytes(s) for s in states.values()), default=0)
+            needed_mb = warmed * largest // (1024 * 1024) + 1
+            print(
+                f"Aviso: cache de prompts comporta {len(states)} de {warmed} prefixos "
+                f"(~{largest // (1024 * 1024)} MB por estado); use TTS_PROMPT_CACHE_MB>={needed_mb} "
+                "ou menos idiomas/tarefas em TTS_PROMPT_CACHE_WARM_LANGS/TTS_PROMPT_CACHE_WARM_TASKS"
             )
-            corrected_text = correction_output["choices"][0]["message"]["content"]
-            # Limpar artefatos indesejados
-            corrected_text = re.sub(r'^Diálogo corregido:\s*\n?', '', corrected_text).strip()
-            # Salvar corrected
-            self._save_to_qdrant("corrected", corrected_text)
-            raw_text = corrected_text
-        
+        return len(states)
+
+    def parse(self, raw_text: str) -> list[tuple[str, str]]:
+        """Etapa de parsing: texto -> [(speaker, text), ...], com estatísticas de tokens."""
         print(f"Raw text (tokens aproximados): {len(raw_text.split())}")
         structured = self._parse_dialogue_structured(raw_text)
         joined = ' '.join([t for _, t in structured])
@@ -245,47 +343,99 @@ class InterviewGenerator:
         print(f"Tokens removidos: {len(raw_text.split()) - len(joined.split())}")
         return structured
 
+    def generate_interview_texts(self, lang: str = "en", selected_topic: str | None = None) -> list[tuple[str, str]]:
+        """Gera, corrige (se especialista) e estrutura o diálogo no idioma informado."""
+        raw_text = self.generate_raw(lang, selected_topic)
+        raw_text = self.correct(lang, raw_text, selected_topic)
+        return self.parse(raw_text)
+
+    def generate_english_interview_texts(self, selected_topic: str | None = None) -> list[tuple[str, str]]:
+        return self.generate_interview_texts("en", selected_topic)
+
+    def generate_spanish_interview_texts(self, selected_topic: str | None = None) -> list[tuple[str, str]]:
+        """Gera diálogo em espanhol, mantendo nomes 'Sarah' e 'Leo' para mapear vozes."""
+        return self.generate_interview_texts("es", selected_topic)
+
+    def _parse_dialogue_structured(self, text: str) -> list[tuple[str, str]]:
+        """Retorna lista de tuplas (speaker, text)."""
+        lines = [ln for ln in text.strip().split('\n') if ln.strip()]
+        return [self._parse_dialogue_line(ln, i) for i, ln in enumerate(lines)]
+
+    @staticmethod
+    def _parse_dialogue_line(line: str, index: int) -> tuple[str, str]:
+        return parse_dialogue_line(line, index)
+
+    def stream_dialogue(self, lang: str = "en", selected_topic: str | None = None) -> Iterator[tuple[str, str]]:
+        """Gera o diálogo com stream=True e emite cada (speaker, text) assim que a linha termina.
+
+        Os especialistas passam pela correção, que precisa do texto completo: nesse caso o
+        diálogo é gerado inteiro e as linhas são emitidas em seguida.
+        """
+        if self.needs_correction():
+            yield from self.generate_interview_texts(lang, selected_topic)
+            return
+
+        messages = self.build_messages(lang, selected_topic)
+        stream = self._complete_stream(
+            messages=messages, max_tokens=TASK_MAX_TOKENS["generate"], temperature=0.7, grammar=dialogue_grammar()
+        )
+        parser = DialogueStreamParser()
+        for chunk in stream:
+            yield from parser.feed(chunk["choices"][0].get("delta", {}).get("content") or "")
+        yield from parser.close()
+        # Mesmo registro do generate_raw quando há especialista
+        if self.specialist:
+            self._save_to_qdrant("generated", parser.text, lang, pair_id_for(parser.text), selected_topic)
+
     def _ensure_qdrant(self):
         """Inicializa Qdrant e o modelo de embeddings apenas quando necessário."""
         if self.qdrant is None:
-            self.qdrant = QdrantClient(path="./qdrant_db")
+            self.qdrant = get_qdrant_client()
         if self.embedder is None:
-            self.embedder = SentenceTransformer('all-MiniLM-L6-v2')
+            self.embedder = get_embedder()
 
-    def _save_to_qdrant(self, collection_name: str, text: str):
-        """Salva texto no Qdrant com embedding."""
-        from qdrant_client.http.models import VectorParams, Distance, PointStruct
-        
-        self._ensure_qdrant()
-        
-        # Criar coleção se não existir
-        try:
-            self.qdrant.get_collection(collection_name)
-        except Exception:
-            self.qdrant.create_collection(
-                collection_name=collection_name,
-                vectors_config=VectorParams(size=384, distance=Distance.COSINE)
-            )
-        
-        # Gerar embedding
-        embedding = self.embedder.encode(text).tolist()
-        
-        # Salvar ponto com ID único
-        point = PointStruct(
-            id=str(uuid4()),
-            vector=embedding,
-            payload={"text": text}
-        )
-        self.qdrant.upsert(collection_name=collection_name, points=[point])
+    def _save_to_qdrant(
+        self,
+        collection_name: str,
+        text: str,
+        lang: Optional[str] = None,
+        point_id: Optional[str] = None,
+        topic: Optional[str] = None,
+        extra: Optional[dict] = None,
+    ):
+        """Enfileira o texto para o Qdrant com payload filtrável (idioma, especialista, modelo, tema, data).
 
-    def _close_qdrant(self):
-        """Fecha o cliente Qdrant de forma segura para evitar erros no shutdown do Python."""
+        O embedding e o upsert saem do caminho da geração: o `QdrantWriter` do cliente
+        agrupa os pontos em lotes numa thread e é descarregado no shutdown.
+        """
+        point_id = point_id or str(uuid4())
+        payload = {
+            "text": text,
+            "pair_id": point_id,
+            "language": lang,
+            "specialist": self.specialist,
+            "model": self.model_type,
+            "topic": topic,
+            "created_at": time.time(),
+            **(extra or {}),
+        }
         try:
-            if self.qdrant is not None:
-                self.qdrant.close()
-        except Exception:
-            # Ignora erros no shutdown
-            pass
+            self._ensure_qdrant()
+            get_qdrant_writer(self.qdrant, self.embedder).submit(collection_name, point_id, text, payload)
+        except Exception as e:
+            # Persistência é best-effort: o diálogo (e o áudio) segue mesmo sem o Qdrant
+            print(f"Aviso: diálogo não salvo no Qdrant ({collection_name}): {e}")
+
+    def _save_corrected(self, lang: str, raw_text: str, corrected_text: str, topic: Optional[str]):
+        """Salva o texto corrigido com o mesmo id do gerado, já com o diff por linha e as estatísticas de edição."""
+        self._save_to_qdrant(
+            "corrected",
+            corrected_text,
+            lang,
+            pair_id_for(raw_text),
+            topic,
+            extra={"diff": line_diff(raw_text, corrected_text), "edit_stats": edit_stats(raw_text, corrected_text)},
+        )
 
 
 if __name__ == "__main__":
@@ -0,0 +1,309 @@
+import os
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Callable, Optional
+import numpy as np
+import soundfile as sf
+from voice_catalog import find_voice
+from voice_index import get_voice_index, sample_rates
+from synthesis import get_synthesis_scheduler, resample_int16
+from audio_assembly import GapSpec, assemble_segments, write_segments
+from audio_integrity import AudioStats, buffer_stats
+from interview_generator import InterviewGenerator, InterviewGeneratorBuilder
+from dialogue_stream import default_queue_size, prefetch
+
+
+@dataclass(frozen=True)
+class LanguageProfile:
+    """Configuração de uma entrevista: idioma, par de vozes (ids do VOICE_CATALOG) e nome de saída."""
+    lang: str
+    label: str
+    sarah_voice: str
+    leo_voice: str
+    output_base: str
+
+    @property
+    def sarah_model(self) -> str:
+        return _catalog_path(self.sarah_voice)
+
+    @property
+    def leo_model(self) -> str:
+        return _catalog_path(self.leo_voice)
+
+
+def _catalog_path(voice_id: str) -> str:
+    found = find_voice(voice_id)
+    if found is None:
+        raise KeyError(f"Voz fora do VOICE_CATALOG: {voice_id}")
+    return found[2]
+
+
+# Registro de idiomas suportados; um novo idioma é só uma nova entrada
+# (mais os prompts em interview_prompts.py)
+LANGUAGE_PROFILES = {
+    "en": LanguageProfile("en", "inglês", "en_US-lessac-medium", "en_US-ryan-medium", "interview_english"),
+    "es": LanguageProfile("es", "espanhol", "es_AR-daniela-high", "es_ES-davefx-medium", "interview_spanish"),
+    # Não há voz feminina pt_BR no catálogo: Sarah usa a voz do cadu
+    "pt": LanguageProfile("pt", "português", "pt_BR-cadu-medium", "pt_BR-faber-medium", "interview_portuguese"),
+}
+
+
+@dataclass
+class PipelineContext:
+    """Estado que flui entre as etapas do pipeline."""
+    profile: LanguageProfile
+    generator: InterviewGenerator
+    selected_topic: Optional[str] = None
+    progress: Optional[Callable[[int, int], None]] = None
+    output_dir: str = "outputs"
+    # Silêncio após cada fala: valor único ou mapa por speaker (ex: {"Sarah": 0.4, "Leo": 0.7})
+    gap_seconds: GapSpec = 0.5
+    # True: grava os segmentos direto no FLAC, sem montar o buffer completo
+    stream_encode: bool = False
+    # Fila entre o stream do LLM e a síntese (STREAMING_STAGES)
+    queue_size: Optional[int] = 4
+    raw_text: str = ""
+    lines: list[tuple[str, str]] = field(default_factory=list)
+    segments: list[Optional[np.ndarray]] = field(default_factory=list)
+    segment_speakers: list[str] = field(default_factory=list)
+    sample_rate: Optional[int] = None
+    audio: Optional[np.ndarray] = None
+    output_path: Optional[str] = None
+    counts: dict = field(default_factory=lambda: {"Sarah": 0, "Leo": 0})
+    sr_mismatch: bool = False
+    # Estatísticas de integridade do áudio final (duração, RMS, pico, clipping, silêncio)
+    integrity: Optional[dict] = None
+    timings: dict = field(default_factory=dict)
+
+
+def stage_generate(ctx: PipelineContext) -> None:
+    ctx.raw_text = ctx.generator.generate_raw(ctx.profile.lang, ctx.selected_topic)
+
+
+def stage_correct(ctx: PipelineContext) -> None:
+    ctx.raw_text = ctx.generator.correct(ctx.profile.lang, ctx.raw_text, ctx.selected_topic)
+
+
+def stage_parse(ctx: PipelineContext) -> None:
+    ctx.lines = ctx.generator.parse(ctx.raw_text)
+
+
+def stage_synthesize(ctx: PipelineContext) -> None:
+    """Sintetiza as falas (possivelmente em paralelo); resultados já na ordem do diálogo."""
+    voices = {"Sarah": ctx.profile.sarah_model, "Leo": ctx.profile.leo_model}
+    speakers = [speaker for speaker, _ in ctx.lines]
+    items = [(voices[speaker], text) for speaker, text in ctx.lines]
+    # Workers sobem só com as duas vozes do perfil; outras carregam sob demanda
+    scheduler = get_synthesis_scheduler(warm_voices=(ctx.profile.sarah_model, ctx.profile.leo_model))
+    synthesized = scheduler.synthesize(items, progress=ctx.progress)
+    for speaker, (audio_i16, current_sr) in zip(speakers, synthesized):
+        _add_segment(ctx, speaker, audio_i16, current_sr)
+
+
+def _add_segment(ctx: PipelineContext, speaker: str, audio_i16: Optional[np.ndarray], current_sr: Optional[int]) -> None:
+    if audio_i16 is None:
+        return
+    if ctx.sample_rate is None:
+        ctx.sample_rate = current_sr
+    if current_sr != ctx.sample_rate:
+        ctx.sr_mismatch = True
+        audio_i16 = resample_int16(audio_i16, current_sr, ctx.sample_rate)
+    ctx.segments.append(audio_i16)
+    ctx.segment_speakers.append(speaker)
+    ctx.counts[speaker] += 1
+
+
+def stage_stream(ctx: PipelineContext) -> None:
+    """generate + parse + synthesize sobrepostos: o LLM gera com stream=True em uma thread,
+    cada fala completa entra em uma fila limitada e já é sintetizada enquanto as próximas
+    são decodificadas. Só vale sem a etapa de correção (que precisa do texto completo)."""
+    voices = {"Sarah": ctx.profile.sarah_model, "Leo": ctx.profile.leo_model}
+    lines = prefetch(ctx.generator.stream_dialogue(ctx.profile.lang, ctx.selected_topic), ctx.queue_size or 1)
+
+    def items():
+        for speaker, text in lines:
+            ctx.lines.append((speaker, text))
+            yield voices[speaker], text
+
+    # Workers sobem só com as duas vozes do perfil; outras carregam sob demanda
+    scheduler = get_synthesis_scheduler(warm_voices=(ctx.profile.sarah_model, ctx.profile.leo_model))
+    for done, (audio_i16, current_sr) in enumerate(scheduler.synthesize_iter(items()), 1):
+        _add_segment(ctx, ctx.lines[done - 1][0], audio_i16, current_sr)
+        if ctx.progress is not None:
+            # Total ainda desconhecido: falas recebidas do LLM até agora
+            ctx.progress(done, len(ctx.lines))
+    ctx.raw_text = "\n".join(f"{speaker}: {text}" for speaker, text in ctx.lines)
+
+
+def stage_assemble(ctx: PipelineContext) -> None:
+    """Monta falas + silêncios (entre os áudios e no final) em um buffer int16 pré-dimensionado."""
+    if not ctx.segments or ctx.stream_encode:
+        return
+    ctx.audio = assemble_segments(ctx.segments, ctx.segment_speakers, ctx.sample_rate, ctx.gap_seconds)
+    # Validação no buffer em memória, antes de codificar
+    _record_integrity(ctx, buffer_stats(ctx.audio, ctx.sample_rate))
+
+
+def _record_integrity(ctx: PipelineContext, stats: AudioStats) -> None:
+    ctx.integrity = stats.to_dict()
+    try:
+        stats.check()
+    except AssertionError as e:
+        ctx.integrity["error"] = str(e)
+        print(f"Aviso: áudio da entrevista em {ctx.profile.label} reprovado na integridade: {e}")
+
+
+def stage_encode(ctx: PipelineContext) -> None:
+    """Salva o arquivo final FLAC com versão incremental (_v2, _v3, ...)."""
+    if ctx.audio is None and not (ctx.stream_encode and ctx.segments):
+        return
+    ctx.output_path = next_output_path(ctx.output_dir, ctx.profile.output_base, ".flac")
+    if ctx.audio is not None:
+        sf.write(ctx.output_path, ctx.audio, ctx.sample_rate, format="FLAC", subtype="PCM_16")
+    else:
+        # Estatísticas acumuladas enquanto os segmentos são gravados
+        stats = AudioStats(ctx.sample_rate)
+        write_segments(ctx.output_path, ctx.segments, ctx.segment_speakers, ctx.sample_rate, ctx.gap_seconds, stats=stats)
+        _record_integrity(ctx, stats)
+
+
+DEFAULT_STAGES: list[tuple[str, Callable[[PipelineContext], None]]] = [
+    ("generate", stage_generate),
+    ("correct", stage_correct),
+    ("parse", stage_parse),
+    ("synthesize", stage_synthesize),
+    ("assemble", stage_assemble),
+    ("encode", stage_encode),
+]
+
+# Partes do pipeline usadas pelo lote (batch_interviews.py): textos do próximo item
+# são gerados enquanto o áudio do atual é sintetizado
+TEXT_STAGES = DEFAULT_STAGES[:3]
+AUDIO_STAGES = DEFAULT_STAGES[3:]
+
+# Sem correção: LLM e síntese sobrepostos
+STREAMING_STAGES: list[tuple[str, Callable[[PipelineContext], None]]] = [
+    ("stream", stage_stream),
+    ("assemble", stage_assemble),
+    ("encode", stage_encode),
+]
+
+
+def next_output_path(output_dir: str, base_name: str, extension: str) -> str:
+    os.makedirs(output_dir, exist_ok=True)
+    version = 1
+    while True:
+        if version == 1:
+            final_output = os.path.join(output_dir, f"{base_name}{extension}")
+        else:
+            final_output = os.path.join(output_dir, f"{base_name}_v{version}{extension}")
+        if not os.path.exists(final_output):
+            return final_output
+        version += 1
+
+
+def interview_voice_paths() -> list[str]:
+    """Todas as vozes usadas pelas entrevistas (para pré-carregar no pool/workers)."""
+    paths = []
+    for profile in LANGUAGE_PROFILES.values():
+        paths.extend([profile.sarah_model, profile.leo_model])
+    return paths
+
+
+class InterviewPipeline:
+    """Pipeline único das entrevistas: generate → correct → parse → synthesize → assemble → encode
+    (ou stream → assemble → encode, com LLM e síntese sobrepostos, quando não há correção).
+
+    As etapas são funções `stage(ctx)` e podem ser substituídas por nome via
+    `overrides`; o tempo de cada etapa fica em `ctx.timings`.
+    """
+
+    def __init__(self, stages: Optional[list[tuple[str, Callable[[PipelineContext], None]]]] = None, overrides: Optional[dict] = None):
+        stages = list(stages or DEFAULT_STAGES)
+        overrides = overrides or {}
+        self.stages = [(name, overrides.get(name, fn)) for name, fn in stages]
+
+    @contextmanager
+    def _timed(self, ctx: PipelineContext, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            ctx.timings[name] = time.perf_counter() - start
+
+    def run(self, ctx: PipelineContext) -> PipelineContext:
+        for name, stage in self.stages:
+            with self._timed(ctx, name):
+                stage(ctx)
+        return ctx
+
+
+def voices_available(profile: LanguageProfile) -> bool:
+    index = get_voice_index()
+    if index:
+        return profile.sarah_voice in index and profile.leo_voice in index
+    return all(
+        os.path.exists(p) and os.path.exists(p + ".parquet")
+        for p in (profile.sarah_model, profile.leo_model)
+    )
+
+
+def run_interview(
+    lang: str,
+    model_type: str = "fast",
+    specialist: Optional[str] = None,
+    selected_topic: Optional[str] = None,
+    generator: Optional[InterviewGenerator] = None,
+    progress: Optional[Callable[[int, int], None]] = None,
+    pipeline: Optional[InterviewPipeline] = None,
+    gap_seconds: GapSpec = 0.5,
+    stream_encode: Optional[bool] = None,
+    profile: Optional[LanguageProfile] = None,
+    output_dir: str = "outputs",
+) -> Optional[PipelineContext]:
+    """Gera uma entrevista no idioma informado usando o par de vozes do registro (ou `profile`).
+    Retorna o contexto final (caminho de saída, contagens e tempos por etapa), ou None sem vozes."""
+    profile = profile or LANGUAGE_PROFILES[lang]
+    # Verificar se os modelos existem
+    if not voices_available(profile):
+        print(f"Modelos para entrevista em {profile.label} não encontrados.")
+        return None
+    # Detecta antes da síntese se as vozes têm sample rates diferentes (Leo será reamostrado)
+    rates = sample_rates([profile.sarah_voice, profile.leo_voice])
+    if None not in rates.values() and len(set(rates.values())) > 1:
+        print(f"Aviso: sample rates diferentes entre as vozes {rates}; reamostrando para {rates[profile.sarah_voice]} Hz.")
+
+    # Gerar textos usando LLM com Builder (ou o gerador já carregado, quando informado)
+    if generator is None:
+        builder = InterviewGeneratorBuilder()
+        builder.set_model_type(model_type)
+        if specialist:
+            builder.set_specialist(specialist)
+        generator = builder.build()
+
+    if stream_encode is None:
+        stream_encode = os.environ.get("TTS_STREAM_ENCODE", "0") == "1"
+    ctx = PipelineContext(
+        profile=profile,
+        generator=generator,
+        selected_topic=selected_topic,
+        progress=progress,
+        output_dir=output_dir,
+        gap_seconds=gap_seconds,
+        stream_encode=stream_encode,
+        queue_size=default_queue_size(),
+    )
+    if pipeline is None:
+        # Sem correção o diálogo pode ser sintetizado enquanto o LLM ainda gera
+        overlap = ctx.queue_size is not None and not generator.needs_correction()
+        pipeline = InterviewPipeline(STREAMING_STAGES if overlap else DEFAULT_STAGES)
+    pipeline.run(ctx)
+
+    if ctx.output_path is None:
+        print(f"Nenhum áudio gerado para a entrevista em {profile.label}.")
+        return ctx
+    print(f"Entrevista em {profile.label} salva em {ctx.output_path}")
+    print(f"Segmentos: Sarah={ctx.counts['Sarah']}, Leo={ctx.counts['Leo']}, SR mismatch={'sim' if ctx.sr_mismatch else 'não'}")
+    print("Tempos por etapa: " + ", ".join(f"{name}={secs:.2f}s" for name, secs in ctx.timings.items()))
+    return ctx
@@ -0,0 +1,140 @@
+# ==========================
+# Prompts das entrevistas por idioma
+# ==========================
+# Cada idioma define os prompts de geração (padrão e "daily"), a mensagem do
+# usuário (com e sem tema) e o prompt do revisor usado na correção (o formato
+# da saída é garantido pela gramática de dialogue_grammar.py). O modo de correção
+# "fused" usa `fused` (restrições do revisor embutidas na geração, por
+# especialista) e `line_fix`/`line_fix_user` para reescrever só as linhas
+# reprovadas pelo validador local.
+INTERVIEW_PROMPTS = {
+    'en': {
+        'label': 'Inglês',
+        'default': (
+            "You are a technical recruiter. Generate a dialogue between Sarah (Interviewer) and Leo (Backend Candidate). "
+            "Topics: REST APIs, SQL, Docker, and Debugging. "
+            "Generate at least 12-16 dialogue exchanges (24-32 lines total) to create a complete interview. "
+            "Format: Return ONLY the dialogue lines, one per line, prefixed with the speaker name: \"Sarah: [text]\" or \"Leo: [text]\". "
+            "Start with Sarah, then alternate speakers logically."
+        ),
+        'daily': (
+            "You are a casual interviewer in an everyday setting. Generate a relaxed, informal dialogue between Sarah (Interviewer) and Leo (Backend Candidate). "
+            "Use everyday language, slang, common expressions, and informal terms. Make it sound like a natural conversation, not a formal interview. "
+            "Topics: REST APIs, SQL, Docker, and Debugging, but discuss them in a laid-back way. "
+            "Generate at least 12-16 dialogue exchanges (24-32 lines total) to create a substantial conversation. "
+            "Format: Return ONLY the dialogue lines, one per line, prefixed with the speaker name: \"Sarah: [text]\" or \"Leo: [text]\". "
+            "Start with Sarah, then alternate speakers logically."
+        ),
+        'user': "Generate the interview now.",
+        'user_topic': "Generate the interview now. Focus on the theme: {topic}.",
+        'correction': (
+            "You are an expert reviewer. Ensure the dialogue has a clear logical order: greeting, background, REST APIs, scalability/design, SQL optimization, Docker usage, debugging example, final wrap-up. "
+            "Ensure speakers alternate starting with Sarah, and every line is prefixed with 'Sarah:' or 'Leo:'. "
+            "If grammar specialist: correct grammar to standard formal English. If daily specialist: keep language natural and conversational. "
+            "IMPORTANT: Preserve the dialogue length. Do NOT shorten or summarize. Keep ALL exchanges from the original. "
+            "Keep the original meaning; do not add extra topics; maintain the number of lines."
+        ),
+        'correction_user': "Correct this dialogue:\n{text}",
+        'fused': {
+            'grammar': (
+                " Follow this order: greeting, background, REST APIs, scalability/design, SQL optimization, Docker usage, debugging example, final wrap-up. "
+                "Write every line in correct, standard formal English, as complete sentences ending with punctuation."
+            ),
+            'daily': (
+                " Follow this order: greeting, background, REST APIs, scalability/design, SQL optimization, Docker usage, debugging example, final wrap-up. "
+                "Keep the language natural and conversational, but every line must be a complete, understandable sentence ending with punctuation."
+            ),
+        },
+        'line_fix': (
+            "You rewrite a single line of an interview dialogue between Sarah and Leo. "
+            "Keep its meaning and its place in the conversation, fix the listed problems, and return ONLY the new text of the line, without the speaker name."
+        ),
+        'line_fix_user': "Previous line: {prev}\nLine by {speaker}: {text}\nProblems: {issues}\nNext line: {next}",
+    },
+    'es': {
+        'label': 'Espanhol',
+        'default': (
+            "Eres un reclutador técnico. Genera un diálogo entre Sarah (Entrevistadora) y Leo (Candidato Backend). "
+            "Temas: APIs REST, SQL, Docker y Depuración. "
+            "Genera al menos 12-16 intercambios de diálogo (24-32 líneas en total) para crear una entrevista completa. "
+            "Formato: Devuelve SOLO las líneas del diálogo, cada una con el nombre del hablante: 'Sarah: [texto]' o 'Leo: [texto]'. "
+            "Empieza con Sarah y alterna de forma lógica."
+        ),
+        'daily': (
+            "Eres un entrevistador casual en un entorno cotidiano. Genera un diálogo relajado e informal entre Sarah (Entrevistadora) y Leo (Candidato Backend). "
+            "Usa lenguaje cotidiano, jerga, expresiones comunes y términos informales. Haz que suene como una conversación natural, no una entrevista formal. "
+            "Temas: APIs REST, SQL, Docker y Depuración, pero discútelos de manera relajada. "
+            "Genera al menos 12-16 intercambios de diálogo (24-32 líneas en total) para crear una conversación sustancial. "
+            "Formato: Devuelve SOLO las líneas del diálogo, cada una con el nombre del hablante: 'Sarah: [texto]' o 'Leo: [texto]'. "
+            "Empieza con Sarah y alterna de forma lógica."
+        ),
+        'user': "Genera la entrevista ahora.",
+        'user_topic': "Genera la entrevista ahora. Enfócate en el tema: {topic}.",
+        'correction': (
+            "Eres un revisor experto. Asegúrate de que el diálogo tenga un orden lógico claro: saludo, antecedentes, APIs REST, escalabilidad/diseño, optimización SQL, uso de Docker, ejemplo de depuración, cierre final. "
+            "Asegúrate de que los hablantes alternen empezando con Sarah, y cada línea esté prefijada con 'Sarah:' o 'Leo:'. "
+            "Si especialista en gramática: corrige la gramática a español estándar formal. Si especialista diario: mantén el lenguaje natural y conversacional. "
+            "IMPORTANTE: Preserva la longitud del diálogo. NO acortes ni resumas. Mantén TODOS los intercambios del original. "
+            "Mantén el significado original; no agregues temas extra; mantén el número de líneas."
+        ),
+        'correction_user': "Corrige este diálogo:\n{text}",
+        'fused': {
+            'grammar': (
+                " Sigue este orden: saludo, antecedentes, APIs REST, escalabilidad/diseño, optimización SQL, uso de Docker, ejemplo de depuración, cierre final. "
+                "Escribe cada línea en español estándar formal y gramaticalmente correcto, con oraciones completas terminadas en puntuación."
+            ),
+            'daily': (
+                " Sigue este orden: saludo, antecedentes, APIs REST, escalabilidad/diseño, optimización SQL, uso de Docker, ejemplo de depuración, cierre final. "
+                "Mantén el lenguaje natural y conversacional, pero cada línea debe ser una oración completa y comprensible terminada en puntuación."
+            ),
+        },
+        'line_fix': (
+            "Reescribes una sola línea de un diálogo de entrevista entre Sarah y Leo. "
+            "Mantén su significado y su lugar en la conversación, corrige los problemas indicados y devuelve SOLO el nuevo texto de la línea, sin el nombre del hablante."
+        ),
+        'line_fix_user': "Línea anterior: {prev}\nLínea de {speaker}: {text}\nProblemas: {issues}\nLínea siguiente: {next}",
+    },
+    'pt': {
+        'label': 'Português',
+        'default': (
+            "Você é um recrutador técnico. Gere um diálogo entre Sarah (Entrevistadora) e Leo (Candidato Backend). "
+            "Temas: APIs REST, SQL, Docker e Depuração. "
+            "Gere pelo menos 12-16 trocas de diálogo (24-32 linhas no total) para criar uma entrevista completa. "
+            "Formato: Retorne SOMENTE as linhas do diálogo, uma por linha, com o nome de quem fala: 'Sarah: [texto]' ou 'Leo: [texto]'. "
+            "Comece com Sarah e alterne de forma lógica."
+        ),
+        'daily': (
+            "Você é um entrevistador descontraído em um ambiente do dia a dia. Gere um diálogo leve e informal entre Sarah (Entrevistadora) e Leo (Candidato Backend). "
+            "Use linguagem cotidiana, gírias, expressões comuns e termos informais. Faça soar como uma conversa natural, não uma entrevista formal. "
+            "Temas: APIs REST, SQL, Docker e Depuração, mas discutidos de forma descontraída. "
+            "Gere pelo menos 12-16 trocas de diálogo (24-32 linhas no total) para criar uma conversa substancial. "
+            "Formato: Retorne SOMENTE as linhas do diálogo, uma por linha, com o nome de quem fala: 'Sarah: [texto]' ou 'Leo: [texto]'. "
+            "Comece com Sarah e alterne de forma lógica."
+        ),
+        'user': "Gere a entrevista agora.",
+        'user_topic': "Gere a entrevista agora. Foque no tema: {topic}.",
+        'correction': (
+            "Você é um revisor especialista. Garanta que o diálogo tenha uma ordem lógica clara: saudação, experiência, APIs REST, escalabilidade/design, otimização SQL, uso de Docker, exemplo de depuração, encerramento. "
+            "Garanta que os falantes alternem começando com Sarah, e que cada linha tenha o prefixo 'Sarah:' ou 'Leo:'. "
+            "Se especialista em gramática: corrija para o português padrão formal. Se especialista diário: mantenha a linguagem natural e conversacional. "
+            "IMPORTANTE: Preserve o tamanho do diálogo. NÃO encurte nem resuma. Mantenha TODAS as trocas do original. "
+            "Mantenha o significado original; não adicione temas extras; mantenha o número de linhas."
+        ),
+        'correction_user': "Corrija este diálogo:\n{text}",
+        'fused': {
+            'grammar': (
+                " Siga esta ordem: saudação, experiência, APIs REST, escalabilidade/design, otimização SQL, uso de Docker, exemplo de depuração, encerramento. "
+                "Escreva cada linha em português padrão formal e gramaticalmente correto, com frases completas terminadas em pontuação."
+            ),
+            'daily': (
+                " Siga esta ordem: saudação, experiência, APIs REST, escalabilidade/design, otimização SQL, uso de Docker, exemplo de depuração, encerramento. "
+                "Mantenha a linguagem natural e conversacional, mas cada linha deve ser uma frase completa e compreensível terminada em pontuação."
+            ),
+        },
+        'line_fix': (
+            "Você reescreve uma única linha de um diálogo de entrevista entre Sarah e Leo. "
+            "Mantenha o significado e o lugar dela na conversa, corrija os problemas indicados e retorne SOMENTE o novo texto da linha, sem o nome de quem fala."
+        ),
+        'line_fix_user': "Linha anterior: {prev}\nLinha de {speaker}: {text}\nProblemas: {issues}\nLinha seguinte: {next}",
+    },
+}
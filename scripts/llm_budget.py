@@ -0,0 +1,62 @@
+import os
+from typing import Optional
+from interview_prompts import INTERVIEW_PROMPTS
+
+# Orçamento de saída (max_tokens) de cada tarefa do gerador
+TASK_MAX_TOKENS = {
+    "topics": 256,
+    "generate": 2500,
+    "correct": 2000,
+    # Reescrita de uma única fala (correção "fused")
+    "line_fix": 160,
+}
+
+# Folga para o template de chat (tokens especiais, papéis) e alinhamento do n_ctx
+CTX_MARGIN = 256
+CTX_ALIGN = 512
+# Tópicos: o assunto digitado pelo usuário entra no prompt; limite estimado
+TOPIC_SUBJECT_TOKENS = 128
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimativa conservadora sem tokenizer (~3 caracteres por token em en/es/pt)."""
+    return len(text) // 3 + 1
+
+
+def task_context_tokens() -> dict[str, int]:
+    """Pior caso (prompt + saída) de cada tarefa, considerando todos os idiomas."""
+    prompts = INTERVIEW_PROMPTS.values()
+    generate_prompt = max(
+        estimate_tokens(max(p["default"], p["daily"], key=len))
+        + estimate_tokens(max(p["fused"].values(), key=len))  # restrições do modo de correção "fused"
+        + estimate_tokens(max(p["user"], p["user_topic"], key=len))
+        for p in prompts
+    ) + TOPIC_SUBJECT_TOKENS
+    # A correção recebe o diálogo gerado inteiro como entrada
+    correct_prompt = max(
+        estimate_tokens(p["correction"]) + estimate_tokens(p["correction_user"]) for p in prompts
+    ) + TASK_MAX_TOKENS["generate"]
+    topics_prompt = 128 + TOPIC_SUBJECT_TOKENS
+    return {
+        "topics": topics_prompt + TASK_MAX_TOKENS["topics"],
+        "generate": generate_prompt + TASK_MAX_TOKENS["generate"],
+        "correct": correct_prompt + TASK_MAX_TOKENS["correct"],
+    }
+
+
+def required_n_ctx(ceiling: Optional[int] = None) -> int:
+    """n_ctx suficiente para a maior tarefa (alinhado a 512), limitado a `ceiling`.
+
+    `TTS_LLM_N_CTX` fixa o valor manualmente.
+    """
+    override = int(os.environ.get("TTS_LLM_N_CTX", "0"))
+    if override > 0:
+        return override
+    needed = max(task_context_tokens().values()) + CTX_MARGIN
+    n_ctx = -(-needed // CTX_ALIGN) * CTX_ALIGN
+    return min(n_ctx, ceiling) if ceiling else n_ctx
+
+
+def fit_max_tokens(prompt_tokens: int, max_tokens: int, n_ctx: int) -> int:
+    """Reduz max_tokens para que prompt + saída caibam no contexto carregado."""
+    return max(1, min(max_tokens, n_ctx - prompt_tokens - 8))
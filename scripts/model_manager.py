@@ -0,0 +1,241 @@
+import os
+import time
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Iterator, Optional
+import llama_cpp
+from llama_cpp import Llama, LlamaDiskCache, LlamaRAMCache
+from llm_budget import required_n_ctx
+
+# Mapeamento de tipos para caminhos de modelos
+MODEL_PATHS = {
+    "fast": "models/Qwen2.5-1.5B-Instruct-Q4_K_M.gguf",  # Modelo menor, mais rápido
+    "reasoning": "models/Llama-3.2-3B-Instruct-Q4_K_M.gguf",  # Modelo maior, melhor raciocínio
+}
+
+# Teto de contexto por modelo; o n_ctx efetivo vem de llm_budget.required_n_ctx
+# (maior prompt + max_tokens entre as tarefas), bem abaixo disso
+N_CTX_MAP = {"fast": 16384, "reasoning": 32768}
+
+# Tipos aceitos para o KV cache (TTS_LLM_KV_TYPE); quantizar reduz ~2x (q8_0) ou ~4x (q4_0) a memória
+KV_CACHE_TYPES = {
+    "f16": llama_cpp.GGML_TYPE_F16,
+    "q8_0": llama_cpp.GGML_TYPE_Q8_0,
+    "q4_0": llama_cpp.GGML_TYPE_Q4_0,
+}
+
+
+def resolve_model_type(model_type: str) -> str:
+    return model_type if model_type in MODEL_PATHS else "fast"
+
+
+def state_bytes(state) -> int:
+    """Memória real de um estado salvo pelo llama.cpp: KV (`llama_state_size`) + logits (`scores`,
+    n_batch × vocabulário floats) + tokens. O LlamaRAMCache só conta o primeiro."""
+    return int(state.llama_state_size) + int(state.scores.nbytes) + int(state.input_ids.nbytes)
+
+
+class MeasuredRAMCache(LlamaRAMCache):
+    """LlamaRAMCache cuja capacidade conta o tamanho medido de cada estado (KV + logits),
+    para o limite de TTS_PROMPT_CACHE_MB valer de fato."""
+
+    @property
+    def cache_size(self):
+        return sum(state_bytes(state) for state in self.cache_state.values())
+
+
+def attach_prompt_cache(llm: Llama, model_type: str) -> None:
+    """Liga o cache de estado (KV) do llama.cpp: prompts que compartilham o prefixo de um
+    prompt já avaliado (ex: o mesmo system prompt) restauram esse estado e só processam o restante.
+
+    TTS_PROMPT_CACHE: "ram" (padrão), "disk" (persistente em TTS_PROMPT_CACHE_DIR) ou "off".
+    """
+    mode = os.environ.get("TTS_PROMPT_CACHE", "ram").lower()
+    if mode == "off":
+        return
+    if mode == "disk":
+        cache_dir = os.path.join(os.environ.get("TTS_PROMPT_CACHE_DIR", "cache/prompt_kv"), model_type)
+        llm.set_cache(LlamaDiskCache(cache_dir=cache_dir))
+    else:
+        capacity = int(os.environ.get("TTS_PROMPT_CACHE_MB", "1024")) * 1024 * 1024
+        llm.set_cache(MeasuredRAMCache(capacity_bytes=capacity))
+
+
+def load_llm(model_type: str = "fast") -> Llama:
+    """Carrega o modelo GGUF correspondente ao tipo ("fast" ou "reasoning")."""
+    model_type = resolve_model_type(model_type)
+    model_path = MODEL_PATHS[model_type]
+    if not os.path.exists(model_path):
+        raise FileNotFoundError(f"Modelo não encontrado: {model_path}")
+    kv_options = {}
+    kv_type = os.environ.get("TTS_LLM_KV_TYPE", "f16").lower()
+    if kv_type != "f16" and kv_type in KV_CACHE_TYPES:
+        # V quantizado no llama.cpp exige flash attention
+        kv_options = {"type_k": KV_CACHE_TYPES[kv_type], "type_v": KV_CACHE_TYPES[kv_type], "flash_attn": True}
+    # Configuração para CPU: n_threads deve ser o número de núcleos físicos do seu PC
+    llm = Llama(
+        model_path=model_path,
+        n_ctx=required_n_ctx(N_CTX_MAP.get(model_type, 8192)),
+        n_threads=3,      # Ajuste conforme seu processador
+        verbose=False,    # Desativa logs pesados do C++
+        **kv_options,
+    )
+    attach_prompt_cache(llm, model_type)
+    return llm
+
+
+@dataclass
+class _Resident:
+    llm: Llama
+    size: int
+    last_used: float = field(default_factory=time.monotonic)
+    lock: threading.Lock = field(default_factory=threading.Lock)
+    # Leases ativos ou esperando o lock (alterado com o _lock do gerenciador): com leases, não é descarregado
+    leases: int = 0
+
+
+class ModelManager:
+    """Mantém os modelos GGUF carregados e compartilhados entre geradores.
+
+    - cada tipo ("fast", "reasoning") é carregado uma vez e reutilizado;
+    - `lease()` serializa o uso de cada instância (llama.cpp não é thread-safe);
+    - modelos ociosos há mais de `idle_ttl` segundos são descarregados;
+    - ao passar de `max_bytes` (soma dos .gguf), o modelo ocioso mais antigo sai.
+
+    `max_bytes` é um teto flexível: se nenhum residente estiver livre (todos com lease),
+    a carga segue mesmo acima dele, com um aviso, em vez de bloquear a requisição.
+    """
+
+    def __init__(self, idle_ttl: float = 900.0, max_bytes: int = 8 * 1024 * 1024 * 1024):
+        self.idle_ttl = idle_ttl
+        self.max_bytes = max_bytes
+        self._models: dict[str, _Resident] = {}
+        # Cargas em andamento: evento sinalizado ao terminar e tamanho já reservado no teto
+        self._loading: dict[str, tuple[threading.Event, int]] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._reaper: Optional[threading.Thread] = None
+
+    def _get(self, model_type: str, lease: bool = False) -> _Resident:
+        """Modelo residente, carregando-o se preciso. Com `lease`, o lease é contado ainda sob o
+        lock do gerenciador, então o reaper não descarrega o modelo antes de `lease()` usá-lo.
+
+        A carga do GGUF (segundos) roda fora do lock do gerenciador: leases de modelos já
+        residentes e o reaper seguem livres. Quem pede o mesmo modelo durante a carga espera
+        pelo evento dela em vez de carregá-lo de novo.
+        """
+        model_type = resolve_model_type(model_type)
+        while True:
+            with self._lock:
+                resident = self._models.get(model_type)
+                if resident is not None:
+                    resident.last_used = time.monotonic()
+                    if lease:
+                        resident.leases += 1
+                    return resident
+                pending = self._loading.get(model_type)
+                if pending is None:
+                    size = os.path.getsize(MODEL_PATHS[model_type]) if os.path.exists(MODEL_PATHS[model_type]) else 0
+                    self._make_room(size)
+                    loaded = threading.Event()
+                    self._loading[model_type] = (loaded, size)
+                    break
+            # Outra thread está carregando: espera e confere de novo (se a carga falhou, tenta aqui)
+            pending[0].wait()
+        try:
+            resident = _Resident(llm=load_llm(model_type), size=size, leases=int(lease))
+            with self._lock:
+                self._models[model_type] = resident
+                self._start_reaper()
+            return resident
+        finally:
+            with self._lock:
+                self._loading.pop(model_type, None)
+            loaded.set()
+
+    @contextmanager
+    def lease(self, model_type: str) -> Iterator[Llama]:
+        """Uso exclusivo do modelo durante o bloco `with`."""
+        resident = self._get(model_type, lease=True)
+        try:
+            with resident.lock:
+                try:
+                    yield resident.llm
+                finally:
+                    resident.last_used = time.monotonic()
+        finally:
+            with self._lock:
+                resident.leases -= 1
+
+    def warmup(self, model_types: list[str]) -> None:
+        for model_type in model_types:
+            try:
+                self._get(model_type)
+            except FileNotFoundError as e:
+                print(f"Aviso: {e}")
+
+    def resident_bytes(self) -> int:
+        return sum(r.size for r in self._models.values()) + sum(size for _, size in self._loading.values())
+
+    def loaded(self) -> list[str]:
+        with self._lock:
+            return list(self._models)
+
+    def _make_room(self, incoming: int) -> None:
+        """Descarrega modelos sem lease (mais antigos primeiro) até caber `incoming` bytes. Chamado com _lock."""
+        for model_type, resident in sorted(self._models.items(), key=lambda kv: kv[1].last_used):
+            if self.resident_bytes() + incoming <= self.max_bytes:
+                return
+            if not resident.leases:
+                del self._models[model_type]
+        total = self.resident_bytes() + incoming
+        if total > self.max_bytes:
+            print(f"Aviso: modelos em uso ocupam {total // (1024 * 1024)} MB, acima de TTS_LLM_MAX_MB ({self.max_bytes // (1024 * 1024)} MB)")
+
+    def unload_idle(self) -> list[str]:
+        """Descarrega os modelos sem uso há mais de `idle_ttl` segundos."""
+        if self.idle_ttl <= 0:
+            return []
+        now = time.monotonic()
+        unloaded = []
+        with self._lock:
+            for model_type, resident in list(self._models.items()):
+                if resident.leases or now - resident.last_used < self.idle_ttl:
+                    continue
+                del self._models[model_type]
+                unloaded.append(model_type)
+        return unloaded
+
+    def _start_reaper(self) -> None:
+        if self._reaper is not None or self.idle_ttl <= 0:
+            return
+        interval = max(1.0, min(60.0, self.idle_ttl / 4))
+
+        def loop():
+            while not self._stop.wait(interval):
+                self.unload_idle()
+
+        self._reaper = threading.Thread(target=loop, name="llm-idle-reaper", daemon=True)
+        self._reaper.start()
+
+    def shutdown(self) -> None:
+        self._stop.set()
+        with self._lock:
+            self._models.clear()
+
+
+_MANAGER: Optional[ModelManager] = None
+_MANAGER_LOCK = threading.Lock()
+
+
+def get_model_manager() -> ModelManager:
+    """Gerenciador compartilhado pelo processo (TTS_LLM_IDLE_TTL em segundos, 0 = nunca; TTS_LLM_MAX_MB)."""
+    global _MANAGER
+    with _MANAGER_LOCK:
+        if _MANAGER is None:
+            _MANAGER = ModelManager(
+                idle_ttl=float(os.environ.get("TTS_LLM_IDLE_TTL", "900")),
+                max_bytes=int(os.environ.get("TTS_LLM_MAX_MB", "8192")) * 1024 * 1024,
+            )
+        return _MANAGER
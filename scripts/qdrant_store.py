@@ -0,0 +1,162 @@
+import os
+import atexit
+import difflib
+import hashlib
+import threading
+import uuid
+from typing import Optional
+from qdrant_client import QdrantClient
+from qdrant_client.http.models import (
+    Distance,
+    FieldCondition,
+    Filter,
+    MatchValue,
+    PayloadSchemaType,
+    Range,
+    VectorParams,
+)
+
+# Coleções do histórico de diálogos (texto gerado e texto corrigido pelos especialistas)
+COLLECTIONS = ("generated", "corrected")
+VECTOR_SIZE = 384  # all-MiniLM-L6-v2
+
+# Campos filtráveis do payload e o tipo do índice de cada um
+PAYLOAD_INDEXES = {
+    "language": PayloadSchemaType.KEYWORD,
+    "specialist": PayloadSchemaType.KEYWORD,
+    "model": PayloadSchemaType.KEYWORD,
+    "created_at": PayloadSchemaType.FLOAT,  # epoch em segundos
+    "topic": PayloadSchemaType.KEYWORD,
+}
+
+_PAIR_NAMESPACE = uuid.UUID("5f0f6c52-8f3e-4d7e-9a51-2d1c3b7e9a10")
+
+
+_CLIENT: Optional[QdrantClient] = None
+_CLIENT_LOCK = threading.Lock()
+
+
+def qdrant_server_mode() -> bool:
+    """True com QDRANT_URL (servidor, compartilhável entre processos); False no modo embutido."""
+    return bool(os.environ.get("QDRANT_URL"))
+
+
+def create_qdrant_client() -> QdrantClient:
+    """Cliente conforme o ambiente.
+
+    QDRANT_URL: servidor Qdrant (ex: http://localhost:6333), com QDRANT_API_KEY opcional e
+    QDRANT_PREFER_GRPC=1 para usar gRPC (porta QDRANT_GRPC_PORT, padrão 6334). Sem URL,
+    modo embutido em QDRANT_PATH (padrão ./qdrant_db; ":memory:" para um banco só em memória).
+    O modo embutido trava o diretório: só um processo por vez.
+    """
+    if qdrant_server_mode():
+        return QdrantClient(
+            url=os.environ["QDRANT_URL"],
+            api_key=os.environ.get("QDRANT_API_KEY") or None,
+            prefer_grpc=os.environ.get("QDRANT_PREFER_GRPC", "0") == "1",
+            grpc_port=int(os.environ.get("QDRANT_GRPC_PORT", "6334")),
+            timeout=int(os.environ.get("QDRANT_TIMEOUT", "10")),
+        )
+    path = os.environ.get("QDRANT_PATH", "./qdrant_db")
+    if path == ":memory:":
+        return QdrantClient(location=":memory:")
+    return QdrantClient(path=path)
+
+
+def get_qdrant_client() -> QdrantClient:
+    """Cliente único do processo (conexão reaproveitada), fechado no atexit."""
+    global _CLIENT
+    with _CLIENT_LOCK:
+        if _CLIENT is None:
+            _CLIENT = create_qdrant_client()
+            atexit.register(close_qdrant_client)
+        return _CLIENT
+
+
+def close_qdrant_client() -> None:
+    """Descarrega a fila de gravação e fecha o cliente compartilhado."""
+    global _CLIENT
+    with _CLIENT_LOCK:
+        client, _CLIENT = _CLIENT, None
+    if client is None:
+        return
+    from qdrant_writer import close_qdrant_writer
+    try:
+        close_qdrant_writer(client)
+        client.close()
+    except Exception:
+        # Ignora erros no shutdown
+        pass
+
+
+def ensure_collection(client: QdrantClient, name: str) -> None:
+    """Cria a coleção (HNSW, cosseno) e os índices de payload se ainda não existirem."""
+    if client.collection_exists(name):
+        return
+    try:
+        client.create_collection(
+            collection_name=name,
+            vectors_config=VectorParams(size=VECTOR_SIZE, distance=Distance.COSINE),
+        )
+    except Exception:
+        # Outro worker criou a coleção no mesmo servidor entre a checagem e a criação
+        if client.collection_exists(name):
+            return
+        raise
+    for field_name, schema in PAYLOAD_INDEXES.items():
+        client.create_payload_index(collection_name=name, field_name=field_name, field_schema=schema)
+
+
+def build_filter(
+    language: Optional[str] = None,
+    specialist: Optional[str] = None,
+    model: Optional[str] = None,
+    since: Optional[float] = None,
+    until: Optional[float] = None,
+    topic: Optional[str] = None,
+) -> Optional[Filter]:
+    """Filtro de payload (idioma, especialista, modelo, tema, intervalo de created_at); None sem condições."""
+    must = [
+        FieldCondition(key=key, match=MatchValue(value=value))
+        for key, value in (("language", language), ("specialist", specialist), ("model", model), ("topic", topic))
+        if value
+    ]
+    if since is not None or until is not None:
+        must.append(FieldCondition(key="created_at", range=Range(gte=since, lte=until)))
+    return Filter(must=must) if must else None
+
+
+def pair_id_for(generated_text: str) -> str:
+    """Id compartilhado pelo ponto "generated" e pelo "corrected" do mesmo diálogo.
+
+    Derivado do texto gerado (uuid5), então a etapa de correção chega ao mesmo id
+    só com o texto que recebe, sem estado entre as etapas.
+    """
+    digest = hashlib.sha256(generated_text.encode("utf-8")).hexdigest()
+    return str(uuid.uuid5(_PAIR_NAMESPACE, digest))
+
+
+def line_diff(generated_text: str, corrected_text: str) -> str:
+    return "\n".join(difflib.unified_diff(generated_text.splitlines(), corrected_text.splitlines(), lineterm=""))
+
+
+def edit_stats(generated_text: str, corrected_text: str) -> dict:
+    """Estatísticas de edição por linha (calculadas na escrita, junto com o diff)."""
+    before, after = generated_text.splitlines(), corrected_text.splitlines()
+    matcher = difflib.SequenceMatcher(a=before, b=after, autojunk=False)
+    changed = added = removed = 0
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "replace":
+            changed += max(i2 - i1, j2 - j1)
+        elif tag == "insert":
+            added += j2 - j1
+        elif tag == "delete":
+            removed += i2 - i1
+    return {
+        "lines_before": len(before),
+        "lines_after": len(after),
+        "lines_changed": changed,
+        "lines_added": added,
+        "lines_removed": removed,
+        "similarity": round(matcher.ratio(), 4),
+    }
@@ -0,0 +1,183 @@
+import os
+import time
+import queue
+import atexit
+import threading
+from dataclasses import dataclass
+from typing import Optional
+from qdrant_client import QdrantClient
+from qdrant_client.http.models import PointStruct
+from embedder import Embedder
+from qdrant_store import COLLECTIONS, ensure_collection
+
+
+@dataclass
+class PendingPoint:
+    collection: str
+    point_id: str
+    text: str
+    payload: dict
+
+
+# Marcadores da fila: encerra a thread / grava o lote parcial imediatamente
+_STOP = object()
+_FLUSH = object()
+
+
+class QdrantWriter:
+    """Gravação write-behind no Qdrant: `submit` só enfileira e volta na hora.
+
+    Uma thread junta até `batch_size` pontos (ou o que chegar em `flush_interval`
+    segundos), gera os embeddings em uma única chamada `encode` sobre a lista e
+    faz um `upsert` por coleção. As coleções são criadas uma vez, na construção.
+    """
+
+    def __init__(
+        self,
+        client: QdrantClient,
+        embedder: Embedder,
+        batch_size: int = 32,
+        flush_interval: float = 1.0,
+    ):
+        self.client = client
+        self.embedder = embedder
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.written = 0
+        self.failed = 0
+        for name in COLLECTIONS:
+            ensure_collection(client, name)
+        self._queue: queue.Queue = queue.Queue()
+        self._closed = False
+        self._state_lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name="qdrant-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, collection: str, point_id: str, text: str, payload: dict) -> None:
+        """Enfileira o ponto; depois do `close` (shutdown) a gravação é descartada com um aviso,
+        sem falhar a geração que a pediu (persistência é best-effort)."""
+        with self._state_lock:
+            if not self._closed:
+                self._queue.put(PendingPoint(collection, point_id, text, payload))
+                return
+        self.failed += 1
+        print(f"Aviso: Qdrant já fechado; ponto {point_id} de \"{collection}\" descartado")
+
+    def flush(self) -> None:
+        """Bloqueia até todos os pontos enfileirados serem gravados."""
+        self._queue.put(_FLUSH)
+        self._queue.join()
+
+    def close(self) -> None:
+        """Grava o que estiver pendente e encerra a thread."""
+        with self._state_lock:
+            if self._closed:
+                return
+            # Nada entra na fila depois do _STOP
+            self._closed = True
+            self._queue.put(_STOP)
+        self._queue.join()
+        self._thread.join()
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                self._queue.task_done()
+                return
+            if item is _FLUSH:
+                self._queue.task_done()
+                continue
+            batch = [item]
+            markers = []
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    nxt = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                if nxt is _STOP or nxt is _FLUSH:
+                    markers.append(nxt)
+                    break
+                batch.append(nxt)
+            self._write(batch)
+            for _ in batch:
+                self._queue.task_done()
+            for marker in markers:
+                self._queue.task_done()
+                if marker is _STOP:
+                    return
+
+    def _write(self, batch: list[PendingPoint]) -> None:
+        try:
+            vectors = self.embedder.encode([p.text for p in batch], batch_size=len(batch))
+            by_collection: dict[str, list[PointStruct]] = {}
+            for pending, vector in zip(batch, vectors):
+                by_collection.setdefault(pending.collection, []).append(
+                    PointStruct(id=pending.point_id, vector=vector.tolist(), payload=pending.payload)
+                )
+            for collection, points in by_collection.items():
+                self.client.upsert(collection_name=collection, points=points)
+            self.written += len(batch)
+        except Exception as e:
+            # Persistência é best-effort: não derruba a thread nem a geração
+            self.failed += len(batch)
+            print(f"Aviso: falha ao gravar {len(batch)} pontos no Qdrant: {e}")
+
+
+_WRITERS: dict[int, QdrantWriter] = {}
+_WRITERS_LOCK = threading.Lock()
+# Clientes cujo writer já foi fechado (shutdown): não se cria outro writer sobre eles.
+# Guarda a referência, e não só o id, para o id não ser reaproveitado por um cliente novo
+_CLOSED_CLIENTS: dict[int, QdrantClient] = {}
+
+
+class _DiscardingWriter:
+    """Writer de um cliente já fechado: descarta as gravações (mesma interface do QdrantWriter)."""
+
+    failed = 0
+
+    def submit(self, collection: str, point_id: str, text: str, payload: dict) -> None:
+        self.failed += 1
+        print(f"Aviso: Qdrant já fechado; ponto {point_id} de \"{collection}\" descartado")
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+def get_qdrant_writer(client: QdrantClient, embedder: Embedder) -> QdrantWriter:
+    """Writer do cliente (um por cliente Qdrant no processo), fechado também no atexit.
+
+    TTS_QDRANT_BATCH: pontos por lote (padrão 32); TTS_QDRANT_FLUSH_SECONDS: espera máxima por lote (padrão 1).
+    """
+    with _WRITERS_LOCK:
+        if id(client) in _CLOSED_CLIENTS:
+            return _DiscardingWriter()
+        writer = _WRITERS.get(id(client))
+        if writer is None:
+            writer = QdrantWriter(
+                client,
+                embedder,
+                batch_size=int(os.environ.get("TTS_QDRANT_BATCH", "32")),
+                flush_interval=float(os.environ.get("TTS_QDRANT_FLUSH_SECONDS", "1")),
+            )
+            _WRITERS[id(client)] = writer
+            atexit.register(writer.close)
+        return writer
+
+
+def close_qdrant_writer(client: Optional[QdrantClient]) -> None:
+    """Descarrega e encerra o writer do cliente antes de fechá-lo."""
+    if client is None:
+        return
+    with _WRITERS_LOCK:
+        writer = _WRITERS.pop(id(client), None)
+        _CLOSED_CLIENTS[id(client)] = client
+    if writer is not None:
+        writer.close()
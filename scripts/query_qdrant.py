@@ -1,53 +1,137 @@
 from qdrant_client import QdrantClient
-from sentence_transformers import SentenceTransformer
-import difflib
-import numpy as np
-
-# Conectar ao Qdrant (persistente)
-qdrant = QdrantClient(path="./qdrant_db")
-embedder = SentenceTransformer('all-MiniLM-L6-v2')
-
-def _best_match(collection: str, query_vec: list[float]):
-    points, _ = qdrant.scroll(collection_name=collection, limit=1000, with_vectors=True)
-    if not points:
-        return None
-    q = np.array(query_vec, dtype=np.float32)
-    def cos(v):
-        v = np.array(v, dtype=np.float32)
-        denom = (np.linalg.norm(q) * np.linalg.norm(v)) + 1e-9
-        return float(np.dot(q, v) / denom)
-    best = max(points, key=lambda p: cos(p.vector))
-    return best
-
-def query_and_compare(query_text: str):
+from embedder import Embedder, get_embedder
+from typing import Optional
+import argparse
+from qdrant_store import build_filter, close_qdrant_client, get_qdrant_client, line_diff
+
+# Últimos clientes obtidos (os compartilhados do processo, criados sob demanda)
+qdrant: Optional[QdrantClient] = None
+embedder: Optional[Embedder] = None
+
+
+def _ensure_clients():
+    """Cliente Qdrant e embedder compartilhados do processo, obtidos apenas no uso."""
+    global qdrant, embedder
+    # Sempre do registro: após um shutdown, o próximo uso abre um cliente novo
+    qdrant = get_qdrant_client()
+    if embedder is None:
+        embedder = get_embedder()
+    return qdrant, embedder
+
+
+def search(
+    client: QdrantClient,
+    collection: str,
+    query_vec: list[float],
+    top_k: int = 1,
+    offset: int = 0,
+    **filters,
+) -> list[dict]:
+    """Busca vetorial nativa (HNSW) com filtros de payload e paginação (`offset`).
+
+    `filters`: language, specialist, model, since, until (epoch em segundos).
+    Retorna [{"id", "score", "payload"}, ...] do mais parecido para o menos.
+    """
+    if not client.collection_exists(collection):
+        return []
+    response = client.query_points(
+        collection_name=collection,
+        query=query_vec,
+        query_filter=build_filter(**filters),
+        limit=top_k,
+        offset=offset,
+        with_payload=True,
+    )
+    return [{"id": str(p.id), "score": p.score, "payload": p.payload or {}} for p in response.points]
+
+
+def search_text(
+    query_text: str,
+    client: QdrantClient,
+    model: Embedder,
+    top_k: int = 5,
+    offset: int = 0,
+    **filters,
+) -> list[dict]:
+    """Top-k diálogos gerados para o texto da consulta, cada um com o corrigido do mesmo par.
+
+    O corrigido é buscado pelo id compartilhado (`retrieve`, sem segunda busca vetorial)
+    e já traz o diff e as estatísticas de edição calculados na escrita.
+    """
+    query_embedding = model.encode(query_text).tolist()
+    hits = search(client, "generated", query_embedding, top_k, offset, **filters)
+    corrected = {}
+    if hits and client.collection_exists("corrected"):
+        points = client.retrieve(collection_name="corrected", ids=[h["id"] for h in hits], with_payload=True)
+        corrected = {str(p.id): p.payload or {} for p in points}
+        # Só pontos antigos: um gerado novo sem corrigido (ainda na fila ou sem correção) fica sem par
+        unlinked = [h for h in hits if h["id"] not in corrected and "pair_id" not in h["payload"]]
+        if unlinked:
+            corrected.update(_nearest_corrected(client, model, unlinked))
+    return [
+        {"pair_id": h["id"], "score": h["score"], "generated": h["payload"], "corrected": corrected.get(h["id"])}
+        for h in hits
+    ]
+
+
+def _nearest_corrected(client: QdrantClient, model: Embedder, hits: list[dict]) -> dict[str, dict]:
+    """Pontos gravados antes do id de par (uuid aleatório, sem `pair_id`): o corrigido é o vizinho
+    mais próximo do texto gerado em "corrected", como antes. O diff é calculado na consulta."""
+    vectors = model.encode([h["payload"].get("text", "") for h in hits])
+    found = {}
+    for hit, vector in zip(hits, vectors):
+        nearest = search(client, "corrected", vector.tolist(), top_k=1)
+        if nearest:
+            found[hit["id"]] = nearest[0]["payload"]
+    return found
+
+
+def compare(query_text: str, client: QdrantClient, model: Embedder, **filters) -> str:
+    """Consulta o diálogo gerado mais parecido e retorna o relatório com as diferenças do par."""
+    return diff_report(search_text(query_text, client, model, top_k=1, **filters))
+
+
+def diff_report(pairs: list[dict]) -> str:
+    """Relatório (texto gerado, corrigido e diff) do melhor par com correção."""
+    pair = next((p for p in pairs if p["corrected"]), None)
+    if pair is None:
+        return "Nenhum resultado encontrado."
+    gen_text = pair["generated"].get("text", "")
+    cor_text = pair["corrected"].get("text", "")
+    diff = pair["corrected"].get("diff")
+    if diff is None:
+        # Ponto salvo antes do diff pré-calculado (ou par achado pelo vizinho mais próximo)
+        diff = line_diff(gen_text, cor_text)
+    lines = [
+        "Texto Gerado:",
+        gen_text,
+        "\nTexto Corrigido:",
+        cor_text,
+        "\nDiferenças:",
+        diff,
+    ]
+    stats = pair["corrected"].get("edit_stats")
+    if stats:
+        lines.append(
+            f"\nEdições: {stats['lines_changed']} linhas alteradas, {stats['lines_added']} adicionadas, "
+            f"{stats['lines_removed']} removidas (similaridade {stats['similarity']:.0%})"
+        )
+    return '\n'.join(lines)
+
+
+def query_and_compare(query_text: str, **filters):
     """Consulta generated e corrected, e mostra diferenças."""
-    query_embedding = embedder.encode(query_text).tolist()
-    
-    gen = _best_match("generated", query_embedding)
-    cor = _best_match("corrected", query_embedding)
-    
-    if gen and cor:
-        gen_text = gen.payload.get("text", "")
-        cor_text = cor.payload.get("text", "")
-        
-        print("Texto Gerado:")
-        print(gen_text)
-        print("\nTexto Corrigido:")
-        print(cor_text)
-        print("\nDiferenças:")
-        diff = difflib.unified_diff(gen_text.splitlines(), cor_text.splitlines(), lineterm='')
-        print('\n'.join(diff))
-    else:
-        print("Nenhum resultado encontrado.")
+    client, model = _ensure_clients()
+    print(compare(query_text, client, model, **filters))
+
 
 if __name__ == "__main__":
-    import sys
-    if len(sys.argv) > 1:
-        query = sys.argv[1]
-        query_and_compare(query)
-    else:
-        print("Uso: python query_qdrant.py 'sua query'")
-    try:
-        qdrant.close()
-    except Exception:
-        pass
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Search generated/corrected dialogues in Qdrant and show the diff.")
+    parser.add_argument("query", help="Query text.")
+    parser.add_argument("--lang", help="Filter by language (en, es, pt).")
+    parser.add_argument("--specialist", help="Filter by specialist (grammar, daily).")
+    parser.add_argument("--model", help="Filter by model (fast, reasoning).")
+    parser.add_argument("--topic", help="Filter by selected topic.")
+    args = parser.parse_args()
+    query_and_compare(args.query, language=args.lang, specialist=args.specialist, model=args.model, topic=args.topic)
+    close_qdrant_client()
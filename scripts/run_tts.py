@@ -1,27 +1,49 @@
+import os
 import argparse
-from audio_generation import run_tests_pt_en, generate_interview_english, generate_interview_spanish
-from interview_generator import InterviewGeneratorBuilder
 
 if __name__ == "__main__":
+    # Imports pesados (llama_cpp, Piper) só aqui: com spawn, cada worker do SynthesisScheduler
+    # reimporta o script principal como __mp_main__, e o topo do módulo não deve puxar o LLM
+    from audio_generation import generate_interview
+    from interview_pipeline import LANGUAGE_PROFILES, interview_voice_paths
+    from tts_health import run_self_test
+    from interview_generator import InterviewGeneratorBuilder
+
     parser = argparse.ArgumentParser(description="Run TTS tests and generate interviews.")
     parser.add_argument("--model", choices=["fast", "reasoning"], default="fast", help="Model type for interview generation.")
     parser.add_argument("--specialist", choices=["grammar", "daily"], help="Specialist type for generation.")
-    parser.add_argument("--langs", nargs="+", choices=["en", "es"], default=["en", "es"], help="Languages to generate.")
+    parser.add_argument("--langs", nargs="+", choices=list(LANGUAGE_PROFILES), default=["en", "es"], help="Languages to generate.")
     parser.add_argument("--topic-subject", help="Subject to suggest topics.")
     parser.add_argument("--selected-topic", help="Selected topic text for conversation generation.")
+    parser.add_argument("--synth-workers", type=int, help="Processes for parallel line synthesis (default: TTS_SYNTH_WORKERS or 1).")
+    parser.add_argument("--self-test", action="store_true", help="Check the interview voices (synthesis latency and audio integrity) before generating.")
+    parser.add_argument("--correction-mode", choices=["two-pass", "fused"], help="Correction for grammar/daily: full second pass or grammar-constrained generation + per-line fixes (default: TTS_CORRECTION_MODE or two-pass).")
 
     args = parser.parse_args()
+    if args.synth_workers:
+        os.environ["TTS_SYNTH_WORKERS"] = str(args.synth_workers)
+    if args.correction_mode:
+        os.environ["TTS_CORRECTION_MODE"] = args.correction_mode
 
-    # Testes unitários PT/EN nas vozes instaladas
-    run_tests_pt_en()
+    if args.self_test:
+        # Self-test sob demanda (sem arquivos): latência por voz das entrevistas
+        report = run_self_test(interview_voice_paths())
+        for v in report["voices"]:
+            print(f"{v['voice_id']}: {'ok' if v['ok'] else ('pulada' if v['ok'] is None else 'FALHOU')}"
+                  + (f" {v['latency_ms']} ms" if v.get("latency_ms") is not None else "")
+                  + (f" ({v['error']})" if v.get("error") else ""))
+        if not report["ok"]:
+            raise SystemExit(1)
 
     selected_topic = args.selected_topic
+    # Um único gerador (modelo GGUF carregado uma vez) para todas as línguas
+    builder = InterviewGeneratorBuilder().set_model_type(args.model)
+    if args.specialist:
+        builder.set_specialist(args.specialist)
+    gen = builder.build()
+
     if args.topic_subject and not selected_topic:
         # Apenas sugerir tópicos e sair
-        builder = InterviewGeneratorBuilder().set_model_type(args.model)
-        if args.specialist:
-            builder.set_specialist(args.specialist)
-        gen = builder.build()
         # Por simplicidade sugerimos em EN
         topics = gen.suggest_topics(args.topic_subject, target_lang="en")
         print("Topic options:")
@@ -31,7 +53,6 @@ if __name__ == "__main__":
         raise SystemExit(0)
 
     # Geração conforme línguas selecionadas
-    if "en" in args.langs:
-        generate_interview_english(args.model, args.specialist, selected_topic)
-    if "es" in args.langs:
-        generate_interview_spanish(args.model, args.specialist, selected_topic)
+    for lang in LANGUAGE_PROFILES:
+        if lang in args.langs:
+            generate_interview(lang, args.model, args.specialist, selected_topic, generator=gen)
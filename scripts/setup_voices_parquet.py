@@ -9,6 +9,7 @@ from urllib.request import urlopen
 from urllib.error import URLError, HTTPError
 from urllib.request import urlretrieve
 import pandas as pd
+from voice_index import build_voice_index
 
 MODELS_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'models'))
 
@@ -141,6 +142,9 @@ def main():
         if os.path.exists(jp):
             os.remove(jp)
 
+    print("Gerando índice consolidado das vozes...")
+    index_path = build_voice_index(MODELS_DIR)
+
     after_total = dir_size(MODELS_DIR)
 
     print("\nResumo de espaço em disco:")
@@ -161,6 +165,7 @@ def main():
     print("\nArquivos gerados:")
     for p in parquet_paths:
         print(f"- {os.path.basename(p)}")
+    print(f"- {os.path.basename(index_path)} (índice)")
 
     print("Concluído.")
 
@@ -0,0 +1,169 @@
+import os
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Callable, Iterable, Iterator, Optional, Sequence, Tuple
+import numpy as np
+from scipy.signal import resample_poly
+from voice_pool import get_voice_pool, synthesize_chunks, voice_id_for
+from synthesis_cache import file_digest, get_synthesis_cache
+from dialogue_stream import prefetch
+
+
+def synthesize_int16(
+    texto: str, model_path: str, config_path: Optional[str] = None
+) -> Tuple[Optional[np.ndarray], Optional[int]]:
+    """Sintetiza o texto com a voz do pool e retorna (audio_int16, sample_rate).
+    Usa o cache de síntese (voz + config + texto normalizado) quando habilitado.
+    Retorna (None, None) se o Piper não produzir áudio.
+    """
+    config_path = config_path or model_path + ".parquet"
+    cache = get_synthesis_cache()
+    key = None
+    if cache is not None:
+        key = cache.make_key(voice_id_for(model_path), file_digest(config_path), texto)
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+    voice = get_voice_pool().get(model_path, config_path)
+    # O Piper emite um chunk por sentença
+    chunks = [c for c in synthesize_chunks(voice, texto) if c.audio_int16_array is not None]
+    if not chunks:
+        return None, None
+    sr = int(chunks[0].sample_rate)
+    audio_i16 = np.concatenate([c.audio_int16_array for c in chunks])
+    if cache is not None:
+        cache.put(key, audio_i16, sr)
+    return audio_i16, sr
+
+
+def resample_int16(audio_i16: np.ndarray, sr_from: int, sr_to: int) -> np.ndarray:
+    """Resample int16 mono audio from sr_from to sr_to using polyphase filtering."""
+    if sr_from == sr_to:
+        return audio_i16
+    # Convert to float32 for processing
+    x = audio_i16.astype(np.float32)
+    # Compute up/down factors via greatest common divisor
+    import math
+    g = math.gcd(sr_from, sr_to)
+    up = sr_to // g
+    down = sr_from // g
+    y = resample_poly(x, up, down)
+    # Back to int16 with clipping
+    y = np.clip(y, -32768, 32767).astype(np.int16)
+    return y
+
+
+def _init_worker(warm_voices: Sequence[str]) -> None:
+    """Inicializa o processo worker carregando as vozes no pool local (vozes quentes)."""
+    pool = get_voice_pool()
+    for model_path in warm_voices:
+        if os.path.exists(model_path) and os.path.exists(model_path + ".parquet"):
+            pool.get(model_path)
+
+
+def _synthesize_item(item: Tuple[int, str, str]) -> Tuple[int, Optional[np.ndarray], Optional[int]]:
+    index, model_path, text = item
+    audio_i16, sr = synthesize_int16(text, model_path)
+    return index, audio_i16, sr
+
+
+class SynthesisScheduler:
+    """Distribui a síntese das falas entre N processos, cada um com suas vozes carregadas.
+
+    Os resultados voltam sempre na ordem do diálogo, então a saída é a mesma
+    para qualquer número de workers. Com `workers <= 1` a síntese roda no
+    próprio processo, sem pool.
+    """
+
+    def __init__(self, workers: int = 1, warm_voices: Sequence[str] = ()):
+        self.workers = max(1, workers)
+        self.warm_voices = tuple(warm_voices)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def set_warm_voices(self, warm_voices: Sequence[str]) -> None:
+        """Vozes pré-carregadas em cada worker; só vale antes de o pool subir
+        (depois, vozes fora da lista são carregadas sob demanda no worker)."""
+        with self._lock:
+            if self._executor is None:
+                self.warm_voices = tuple(warm_voices)
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # spawn: evita fork de um processo com threads do llama.cpp/onnxruntime ativas
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker,
+                    initargs=(self.warm_voices,),
+                )
+            return self._executor
+
+    def synthesize(
+        self,
+        items: Sequence[Tuple[str, str]],
+        progress: Optional[Callable[[int, int], None]] = None,
+    ) -> list[Tuple[Optional[np.ndarray], Optional[int]]]:
+        """Sintetiza [(model_path, text), ...] e retorna [(audio_int16, sample_rate), ...] na mesma ordem."""
+        total = len(items)
+        results: list[Tuple[Optional[np.ndarray], Optional[int]]] = [(None, None)] * total
+        if self.workers <= 1 or total <= 1:
+            for index, (model_path, text) in enumerate(items):
+                results[index] = synthesize_int16(text, model_path)
+                if progress is not None:
+                    progress(index + 1, total)
+            return results
+
+        executor = self._get_executor()
+        futures = [executor.submit(_synthesize_item, (i, mp, t)) for i, (mp, t) in enumerate(items)]
+        for done, future in enumerate(as_completed(futures), 1):
+            index, audio_i16, sr = future.result()
+            results[index] = (audio_i16, sr)
+            if progress is not None:
+                progress(done, total)
+        return results
+
+    def synthesize_iter(self, items: Iterable[Tuple[str, str]]) -> Iterator[Tuple[Optional[np.ndarray], Optional[int]]]:
+        """Como `synthesize`, mas consome os itens conforme chegam (ex: falas vindas do stream do LLM)
+        e entrega cada resultado, na ordem, assim que ele e os anteriores ficam prontos."""
+        if self.workers <= 1:
+            for model_path, text in items:
+                yield synthesize_int16(text, model_path)
+            return
+
+        executor = self._get_executor()
+        # Os itens são lidos e submetidos em outra thread: com um produtor lento (stream do LLM),
+        # um áudio já sintetizado sai na hora, sem esperar a próxima fala chegar
+        submitted = (
+            executor.submit(_synthesize_item, (index, model_path, text))
+            for index, (model_path, text) in enumerate(items)
+        )
+        for future in prefetch(submitted, maxsize=2 * self.workers):
+            _, audio_i16, sr = future.result()
+            yield audio_i16, sr
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True, cancel_futures=True)
+                self._executor = None
+
+
+_SCHEDULER: Optional[SynthesisScheduler] = None
+_SCHEDULER_LOCK = threading.Lock()
+
+
+def get_synthesis_scheduler(warm_voices: Sequence[str] = ()) -> SynthesisScheduler:
+    """Scheduler compartilhado pelo processo (número de processos via TTS_SYNTH_WORKERS, padrão 1)."""
+    global _SCHEDULER
+    with _SCHEDULER_LOCK:
+        if _SCHEDULER is None:
+            _SCHEDULER = SynthesisScheduler(
+                workers=int(os.environ.get("TTS_SYNTH_WORKERS", "1")),
+                warm_voices=warm_voices,
+            )
+        elif warm_voices:
+            _SCHEDULER.set_warm_voices(warm_voices)
+        return _SCHEDULER
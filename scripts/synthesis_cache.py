@@ -0,0 +1,155 @@
+import os
+import re
+import json
+import zipfile
+import hashlib
+import threading
+import unicodedata
+from typing import Optional, Tuple
+import numpy as np
+
+
+def normalize_text(text: str) -> str:
+    """Normaliza o texto para a chave do cache (NFC, espaços colapsados)."""
+    return re.sub(r"\s+", " ", unicodedata.normalize("NFC", text)).strip()
+
+
+_DIGESTS: dict[tuple[str, int, int], str] = {}
+
+
+def file_digest(path: str) -> str:
+    """sha256 do arquivo, memorizado por (caminho, tamanho, mtime)."""
+    st = os.stat(path)
+    key = (os.path.abspath(path), st.st_size, st.st_mtime_ns)
+    digest = _DIGESTS.get(key)
+    if digest is None:
+        h = hashlib.sha256()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                h.update(block)
+        digest = h.hexdigest()
+        _DIGESTS[key] = digest
+    return digest
+
+
+class SynthesisCache:
+    """Cache em disco de áudio sintetizado (PCM int16 + sample rate).
+
+    A chave é o hash de (voz, config, texto normalizado, parâmetros de síntese).
+    Cada entrada é um `.npz` em `cache_dir`; o mtime marca o último uso e as
+    entradas mais antigas são removidas quando o total passa de `max_bytes`.
+    """
+
+    def __init__(self, cache_dir: str = "cache/synthesis", max_bytes: int = 1024 * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._total_bytes: Optional[int] = None
+
+    @staticmethod
+    def make_key(voice_id: str, config_digest: str, text: str, params: Optional[dict] = None) -> str:
+        payload = json.dumps(
+            {"voice": voice_id, "config": config_digest, "text": normalize_text(text), "params": params or {}},
+            sort_keys=True,
+            ensure_ascii=False,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], key + ".npz")
+
+    def get(self, key: str) -> Optional[Tuple[np.ndarray, int]]:
+        path = self._path(key)
+        try:
+            with np.load(path) as data:
+                audio = data["audio"]
+                sample_rate = int(data["sample_rate"])
+            os.utime(path)  # marca uso recente (LRU)
+        except (OSError, KeyError, ValueError, zipfile.BadZipFile):
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return audio, sample_rate
+
+    def put(self, key: str, audio: np.ndarray, sample_rate: int) -> None:
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            np.savez(f, audio=np.asarray(audio, dtype=np.int16), sample_rate=np.int32(sample_rate))
+        with self._lock:
+            # Sobrescrever uma chave substitui o arquivo: só a diferença de tamanho entra no total
+            try:
+                old_size = os.path.getsize(path)
+            except OSError:
+                old_size = 0
+            os.replace(tmp_path, path)  # escrita atômica: leitores nunca veem arquivo parcial
+            if self._total_bytes is None:
+                self._total_bytes = self._scan_bytes()
+            else:
+                self._total_bytes += os.path.getsize(path) - old_size
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+
+    def _entries(self) -> list[tuple[float, int, str]]:
+        entries = []
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                if name.endswith(".npz"):
+                    p = os.path.join(root, name)
+                    try:
+                        st = os.stat(p)
+                    except OSError:
+                        continue
+                    entries.append((st.st_mtime, st.st_size, p))
+        return entries
+
+    def _scan_bytes(self) -> int:
+        return sum(size for _, size, _ in self._entries())
+
+    def _evict(self) -> None:
+        """Remove as entradas usadas há mais tempo até ficar em 90% do limite."""
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        target = int(self.max_bytes * 0.9)
+        for _, size, p in entries:
+            if total <= target:
+                break
+            try:
+                os.remove(p)
+                total -= size
+            except OSError:
+                pass
+        self._total_bytes = total
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": (self.hits / lookups) if lookups else 0.0,
+                "bytes": self._total_bytes,
+            }
+
+
+_CACHE: Optional[SynthesisCache] = None
+_CACHE_LOCK = threading.Lock()
+
+
+def get_synthesis_cache() -> Optional[SynthesisCache]:
+    """Cache compartilhado pelo processo; None quando TTS_SYNTH_CACHE=off."""
+    global _CACHE
+    if os.environ.get("TTS_SYNTH_CACHE", "on").lower() in ("0", "off", "false", "no"):
+        return None
+    with _CACHE_LOCK:
+        if _CACHE is None:
+            _CACHE = SynthesisCache(
+                cache_dir=os.environ.get("TTS_SYNTH_CACHE_DIR", "cache/synthesis"),
+                max_bytes=int(os.environ.get("TTS_SYNTH_CACHE_MAX_MB", "1024")) * 1024 * 1024,
+            )
+        return _CACHE
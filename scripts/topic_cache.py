@@ -0,0 +1,193 @@
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from typing import Optional
+import numpy as np
+from synthesis_cache import normalize_text
+
+
+def normalize_subject(subject: str) -> str:
+    """Assunto para a chave exata: normalizado e sem diferença de maiúsculas."""
+    return normalize_text(subject).casefold()
+
+
+class TopicCache:
+    """Cache persistente (SQLite) das sugestões de tópicos.
+
+    A chave é (assunto normalizado, idioma alvo, modelo, especialista). Entradas
+    expiram após `ttl` segundos e, acima de `max_entries`, as usadas há mais
+    tempo saem primeiro. Com um embedder, um assunto diferente mas com
+    similaridade de cosseno >= `similarity` com um já salvo também conta como acerto.
+    """
+
+    def __init__(
+        self,
+        path: str = "cache/topics.sqlite3",
+        ttl: float = 7 * 24 * 3600,
+        max_entries: int = 5000,
+        similarity: float = 0.92,
+    ):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.similarity = similarity
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS topics (
+                key TEXT PRIMARY KEY,
+                subject TEXT NOT NULL,
+                target_lang TEXT NOT NULL,
+                model TEXT NOT NULL,
+                specialist TEXT NOT NULL,
+                topics_json TEXT NOT NULL,
+                embedding BLOB,
+                created_at REAL NOT NULL,
+                last_used REAL NOT NULL
+            )"""
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS topics_scope ON topics (target_lang, model, specialist)")
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(subject: str, target_lang: str, model: str, specialist: Optional[str]) -> str:
+        payload = json.dumps([normalize_subject(subject), target_lang, model, specialist or ""], ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(
+        self,
+        subject: str,
+        target_lang: str,
+        model: str,
+        specialist: Optional[str],
+        embedding: Optional[np.ndarray] = None,
+    ) -> Optional[list[str]]:
+        """Tópicos em cache para o assunto (exato ou, com `embedding`, o mais parecido)."""
+        now = time.time()
+        min_created = now - self.ttl
+        key = self.make_key(subject, target_lang, model, specialist)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT key, topics_json FROM topics WHERE key = ? AND created_at >= ?", (key, min_created)
+            ).fetchone()
+            if row is None and embedding is not None and self.similarity > 0:
+                row = self._nearest(embedding, target_lang, model, specialist or "", min_created)
+            if row is None:
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE topics SET last_used = ? WHERE key = ?", (now, row[0]))
+            self._conn.commit()
+            self.hits += 1
+        return json.loads(row[1])
+
+    def _nearest(self, embedding: np.ndarray, target_lang: str, model: str, specialist: str, min_created: float):
+        """Linha com maior similaridade de cosseno no mesmo escopo, se passar do limiar. Chamado com _lock."""
+        rows = self._conn.execute(
+            "SELECT key, topics_json, embedding FROM topics"
+            " WHERE target_lang = ? AND model = ? AND specialist = ? AND created_at >= ? AND embedding IS NOT NULL",
+            (target_lang, model, specialist, min_created),
+        ).fetchall()
+        q = np.asarray(embedding, dtype=np.float32)
+        q = q / (np.linalg.norm(q) + 1e-9)
+        # Ignora vetores de outro embedder (dimensão diferente)
+        rows = [r for r in rows if len(r[2]) == q.nbytes]
+        if not rows:
+            return None
+        # Embeddings salvos já normalizados: o cosseno é o produto escalar
+        matrix = np.stack([np.frombuffer(r[2], dtype=np.float32) for r in rows])
+        scores = matrix @ q
+        best = int(np.argmax(scores))
+        if scores[best] < self.similarity:
+            return None
+        return rows[best][0], rows[best][1]
+
+    def put(
+        self,
+        subject: str,
+        target_lang: str,
+        model: str,
+        specialist: Optional[str],
+        topics: list[str],
+        embedding: Optional[np.ndarray] = None,
+    ) -> None:
+        now = time.time()
+        blob = None
+        if embedding is not None:
+            vec = np.asarray(embedding, dtype=np.float32)
+            blob = (vec / (np.linalg.norm(vec) + 1e-9)).astype(np.float32).tobytes()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO topics VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    self.make_key(subject, target_lang, model, specialist),
+                    normalize_subject(subject),
+                    target_lang,
+                    model,
+                    specialist or "",
+                    json.dumps(topics, ensure_ascii=False),
+                    blob,
+                    now,
+                    now,
+                ),
+            )
+            self._evict(now)
+            self._conn.commit()
+
+    def _evict(self, now: float) -> None:
+        """Remove expiradas e, acima de max_entries, as menos usadas recentemente. Chamado com _lock."""
+        self._conn.execute("DELETE FROM topics WHERE created_at < ?", (now - self.ttl,))
+        self._conn.execute(
+            "DELETE FROM topics WHERE key IN (SELECT key FROM topics ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,),
+        )
+
+    def stats(self) -> dict:
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM topics").fetchone()[0]
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": (self.hits / lookups) if lookups else 0.0,
+                "entries": entries,
+            }
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+_CACHE: Optional[TopicCache] = None
+_CACHE_LOCK = threading.Lock()
+
+
+def get_topic_cache() -> Optional[TopicCache]:
+    """Cache compartilhado pelo processo; None quando TTS_TOPIC_CACHE=off."""
+    global _CACHE
+    if os.environ.get("TTS_TOPIC_CACHE", "on").lower() in ("0", "off", "false", "no"):
+        return None
+    with _CACHE_LOCK:
+        if _CACHE is None:
+            _CACHE = TopicCache(
+                path=os.environ.get("TTS_TOPIC_CACHE_PATH", "cache/topics.sqlite3"),
+                ttl=float(os.environ.get("TTS_TOPIC_CACHE_TTL", str(7 * 24 * 3600))),
+                max_entries=int(os.environ.get("TTS_TOPIC_CACHE_MAX", "5000")),
+                similarity=float(os.environ.get("TTS_TOPIC_CACHE_SIMILARITY", "0.92")),
+            )
+        return _CACHE
+
+
+def close_topic_cache() -> None:
+    """Fecha a conexão do cache compartilhado (shutdown da API)."""
+    global _CACHE
+    with _CACHE_LOCK:
+        if _CACHE is not None:
+            _CACHE.close()
+            _CACHE = None
@@ -0,0 +1,100 @@
+import os
+import time
+import threading
+from typing import Optional, Sequence
+import numpy as np
+from voice_pool import get_voice_pool, synthesize_chunks, voice_id_for
+from audio_integrity import buffer_stats
+
+# Frases fixas (saída determinística) por idioma do nome da voz
+SELF_TEST_TEXTS = {
+    "pt": "Otimização concluída com Piper TTS via API.",
+    "en": "Optimization completed with Piper TTS via API.",
+    "es": "Optimización completada con Piper TTS vía API.",
+}
+
+
+def check_voice(model_path: str, text: Optional[str] = None) -> dict:
+    """Sintetiza a frase de teste com a voz (já quente no pool) e valida o buffer em memória.
+
+    Não usa o cache de síntese (a latência medida é a do Piper) nem grava arquivos.
+    """
+    voice_id = voice_id_for(model_path)
+    text = text or SELF_TEST_TEXTS.get(voice_id.split("_")[0], SELF_TEST_TEXTS["en"])
+    result = {"voice_id": voice_id, "ok": False, "latency_ms": None, "load_ms": None, "rtf": None, "error": None}
+    try:
+        start = time.perf_counter()
+        voice = get_voice_pool().get(model_path)
+        loaded = time.perf_counter()
+        chunks = [c for c in synthesize_chunks(voice, text) if c.audio_int16_array is not None]
+        elapsed = time.perf_counter() - loaded
+        if not chunks:
+            raise AssertionError("Nenhum chunk de áudio retornado pelo Piper")
+        sample_rate = int(chunks[0].sample_rate)
+        stats = buffer_stats(np.concatenate([c.audio_int16_array for c in chunks]), sample_rate)
+        stats.check(expected_rate=int(voice.config.sample_rate))
+        result.update(
+            ok=True,
+            load_ms=round((loaded - start) * 1000, 1),
+            latency_ms=round(elapsed * 1000, 1),
+            # Real-time factor: segundos de CPU por segundo de áudio
+            rtf=round(elapsed / stats.duration, 3) if stats.duration else None,
+            audio=stats.to_dict(),
+        )
+    except Exception as e:
+        result["error"] = str(e)
+    return result
+
+
+def run_self_test(model_paths: Sequence[str]) -> dict:
+    """Checa cada voz instalada da lista; vozes ausentes aparecem como puladas."""
+    start = time.perf_counter()
+    voices = []
+    for model_path in model_paths:
+        if os.path.exists(model_path) and os.path.exists(model_path + ".parquet"):
+            voices.append(check_voice(model_path))
+        else:
+            voices.append({"voice_id": voice_id_for(model_path), "ok": None, "error": "voz não instalada"})
+    checked = [v for v in voices if v["ok"] is not None]
+    return {
+        "ok": bool(checked) and all(v["ok"] for v in checked),
+        "checked_at": time.time(),
+        "duration_ms": round((time.perf_counter() - start) * 1000, 1),
+        "voices": voices,
+    }
+
+
+class TTSHealth:
+    """Resultado do self-test em cache: roda no startup (ou sob demanda) e é reaproveitado
+    até `max_age` segundos, em vez de sintetizar e reler arquivos a cada job."""
+
+    def __init__(self, model_paths: Sequence[str], max_age: float = 3600.0):
+        self.model_paths = list(dict.fromkeys(model_paths))
+        self.max_age = max_age
+        self._report: Optional[dict] = None
+        self._lock = threading.Lock()
+
+    def report(self, refresh: bool = False) -> dict:
+        with self._lock:
+            stale = self._report is None or (
+                self.max_age > 0 and time.time() - self._report["checked_at"] > self.max_age
+            )
+            if refresh or stale:
+                self._report = run_self_test(self.model_paths)
+            return self._report
+
+    def cached(self) -> Optional[dict]:
+        return self._report
+
+
+_HEALTH: Optional[TTSHealth] = None
+_HEALTH_LOCK = threading.Lock()
+
+
+def get_tts_health(model_paths: Sequence[str] = ()) -> TTSHealth:
+    """Self-test compartilhado pelo processo (validade do resultado via TTS_SELF_TEST_MAX_AGE, em segundos; 0 = sempre válido)."""
+    global _HEALTH
+    with _HEALTH_LOCK:
+        if _HEALTH is None:
+            _HEALTH = TTSHealth(model_paths, max_age=float(os.environ.get("TTS_SELF_TEST_MAX_AGE", "3600")))
+        return _HEALTH
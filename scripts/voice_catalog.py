@@ -35,4 +35,13 @@ VOICE_CATALOG = {
             ('es_AR-daniela-high', 'models/es_AR-daniela-high.onnx'),
         ],
     },
-}
\ No newline at end of file
+}
+
+def find_voice(voice_id: str):
+    """Procura a voz no catálogo e retorna (lang, gender, model_path), ou None."""
+    for lang, genders in VOICE_CATALOG.items():
+        for gender, options in genders.items():
+            for display, model_path in options:
+                if display == voice_id:
+                    return lang, gender, model_path
+    return None
@@ -0,0 +1,51 @@
+import os
+import json
+import threading
+from typing import Optional
+import onnxruntime
+import pyarrow.parquet as pq
+from piper.config import PiperConfig
+from piper.voice import PiperVoice
+from voice_index import INDEX_PATH, get_voice_index
+
+_CONFIGS: dict[tuple[str, int], dict] = {}
+_CONFIGS_LOCK = threading.Lock()
+
+
+def load_voice_config(config_parquet: str) -> dict:
+    """Lê a config da voz como dict, uma vez por arquivo.
+
+    Usa o índice consolidado (models/voices_index.parquet) quando a voz está nele;
+    senão lê o .onnx.parquet com pyarrow direto (sem pandas). O resultado fica em
+    memória e é invalidado se o arquivo de origem mudar.
+    """
+    name = os.path.basename(config_parquet)
+    voice_id = name[:-len(".onnx.parquet")] if name.endswith(".onnx.parquet") else None
+    row = get_voice_index().get(voice_id) if voice_id else None
+    source = INDEX_PATH if row is not None else config_parquet
+    key = (os.path.abspath(config_parquet), os.stat(source).st_mtime_ns)
+    with _CONFIGS_LOCK:
+        cfg = _CONFIGS.get(key)
+    if cfg is None:
+        cfg = json.loads(row["config_json"]) if row is not None else pq.read_table(config_parquet).to_pylist()[0]
+        with _CONFIGS_LOCK:
+            _CONFIGS[key] = cfg
+    return cfg
+
+
+def voice_sample_rate(config_parquet: str, default: int = 22050) -> int:
+    return int((load_voice_config(config_parquet).get("audio") or {}).get("sample_rate", default))
+
+
+def build_piper_voice(model_path: str, config_parquet: Optional[str] = None) -> PiperVoice:
+    """Monta a PiperVoice a partir do .onnx e da config em memória, sem JSON temporário.
+    `TTS_ONNX_THREADS` limita as threads intra-op de cada sessão (útil com vários workers)."""
+    cfg = load_voice_config(config_parquet or model_path + ".parquet")
+    options = onnxruntime.SessionOptions()
+    threads = int(os.environ.get("TTS_ONNX_THREADS", "0"))
+    if threads > 0:
+        options.intra_op_num_threads = threads
+    session = onnxruntime.InferenceSession(
+        str(model_path), sess_options=options, providers=["CPUExecutionProvider"]
+    )
+    return PiperVoice(session=session, config=PiperConfig.from_dict(cfg))
@@ -0,0 +1,91 @@
+import os
+import json
+import glob
+import threading
+from typing import Optional
+import pyarrow as pa
+import pyarrow.parquet as pq
+from voice_catalog import find_voice
+from synthesis_cache import file_digest
+
+# Índice único (uma linha por voz) gerado pelo setup das vozes
+INDEX_PATH = os.path.join("models", "voices_index.parquet")
+
+
+def _parse_voice_id(voice_id: str) -> tuple[str, str, str]:
+    """en_US-ryan-medium -> ("en", "en_US", "medium")."""
+    locale, _, rest = voice_id.partition("-")
+    quality = rest.rsplit("-", 1)[-1] if "-" in rest else ""
+    return locale.split("_")[0], locale, quality
+
+
+def _index_row(model_path: str, config: dict) -> dict:
+    voice_id = os.path.basename(model_path)[:-len(".onnx")]
+    language, locale, quality = _parse_voice_id(voice_id)
+    lang_cfg = config.get("language") or {}
+    found = find_voice(voice_id)
+    return {
+        "voice_id": voice_id,
+        "language": lang_cfg.get("family") or language,
+        "locale": lang_cfg.get("code") or locale,
+        "gender": found[1] if found else None,
+        "quality": (config.get("audio") or {}).get("quality") or quality,
+        "sample_rate": int((config.get("audio") or {}).get("sample_rate", 22050)),
+        "num_speakers": int(config.get("num_speakers") or 1),
+        "phoneme_id_map": json.dumps(config.get("phoneme_id_map") or {}, ensure_ascii=False),
+        "config_json": json.dumps(config, ensure_ascii=False),
+        "onnx_path": model_path,
+        "onnx_size": os.path.getsize(model_path),
+        "onnx_sha256": file_digest(model_path),
+    }
+
+
+def build_voice_index(models_dir: str = "models", index_path: Optional[str] = None) -> str:
+    """Gera o índice colunar de todas as vozes instaladas (.onnx + .onnx.parquet) em um único Parquet."""
+    rows = []
+    for model_path in sorted(glob.glob(os.path.join(models_dir, "*.onnx"))):
+        config_path = model_path + ".parquet"
+        if not os.path.exists(config_path):
+            continue
+        config = pq.read_table(config_path).to_pylist()[0]
+        rows.append(_index_row(model_path, config))
+    index_path = index_path or os.path.join(models_dir, os.path.basename(INDEX_PATH))
+    pq.write_table(pa.Table.from_pylist(rows), index_path)
+    return index_path
+
+
+_INDEX: Optional[dict[str, dict]] = None
+_INDEX_KEY: Optional[tuple[str, int]] = None
+_INDEX_LOCK = threading.Lock()
+
+
+def get_voice_index(index_path: str = INDEX_PATH) -> dict[str, dict]:
+    """Índice {voice_id: linha} lido de uma só vez e mantido em memória ({} se ainda não gerado)."""
+    global _INDEX, _INDEX_KEY
+    try:
+        key = (os.path.abspath(index_path), os.stat(index_path).st_mtime_ns)
+    except FileNotFoundError:
+        return {}
+    with _INDEX_LOCK:
+        if _INDEX is None or _INDEX_KEY != key:
+            _INDEX = {row["voice_id"]: row for row in pq.read_table(index_path).to_pylist()}
+            _INDEX_KEY = key
+        return _INDEX
+
+
+def available_voices(lang: Optional[str] = None, gender: Optional[str] = None) -> list[dict]:
+    """Vozes instaladas segundo o índice, filtradas por idioma/gênero (sem config nem mapa de fonemas)."""
+    result = []
+    for row in get_voice_index().values():
+        if lang and row["language"] != lang:
+            continue
+        if gender and row["gender"] != gender:
+            continue
+        result.append({k: v for k, v in row.items() if k not in ("config_json", "phoneme_id_map")})
+    return result
+
+
+def sample_rates(voice_ids: list[str]) -> dict[str, Optional[int]]:
+    """Sample rate de cada voz segundo o índice (None se ausente), para detectar divergências antes da síntese."""
+    index = get_voice_index()
+    return {vid: (index[vid]["sample_rate"] if vid in index else None) for vid in voice_ids}
@@ -0,0 +1,116 @@
+import os
+import threading
+from collections import OrderedDict
+from typing import Optional
+from piper.voice import PiperVoice
+from voice_config import build_piper_voice
+
+
+# O fonemizador do Piper (espeak-ng) guarda estado global no processo (set_voice seguido de
+# get_phonemes): duas sínteses simultâneas em idiomas diferentes podem fonemizar com a voz
+# errada. Toda síntese no processo passa por este lock; o paralelismo fica com os processos
+# do SynthesisScheduler, cada um com seu espeak.
+SYNTH_LOCK = threading.Lock()
+
+
+def synthesize_chunks(voice: PiperVoice, text: str) -> list:
+    """Chunks do Piper (um por sentença) de uma fala, sintetizada com exclusividade no processo."""
+    with SYNTH_LOCK:
+        return list(voice.synthesize(text))
+
+
+def voice_id_for(model_path: str) -> str:
+    """Deriva o id da voz (ex: en_US-ryan-medium) a partir do caminho do .onnx."""
+    name = os.path.basename(model_path)
+    return name[:-len(".onnx")] if name.endswith(".onnx") else name
+
+
+class VoicePool:
+    """Pool de vozes Piper carregadas, indexado pelo id da voz.
+
+    Cada voz é carregada uma única vez e mantida em memória. Quando o número de
+    vozes ou o tamanho estimado (soma dos .onnx) passa dos limites, as vozes
+    usadas há mais tempo são descartadas (LRU).
+    """
+
+    def __init__(self, max_voices: int = 8, max_bytes: int = 512 * 1024 * 1024):
+        self.max_voices = max_voices
+        self.max_bytes = max_bytes
+        self._voices: "OrderedDict[str, tuple[PiperVoice, int]]" = OrderedDict()
+        self._lock = threading.RLock()
+        self._loading: dict[str, threading.Event] = {}
+        self.loads = 0
+        self.hits = 0
+
+    def get(self, model_path: str, config_path: Optional[str] = None) -> PiperVoice:
+        """Retorna a voz do pool, carregando-a na primeira vez.
+
+        A carga roda fora do lock do pool (vozes já carregadas continuam disponíveis);
+        quem pede a mesma voz durante a carga espera por ela em vez de carregá-la de novo.
+        """
+        voice_id = voice_id_for(model_path)
+        while True:
+            with self._lock:
+                entry = self._voices.get(voice_id)
+                if entry is not None:
+                    self._voices.move_to_end(voice_id)
+                    self.hits += 1
+                    return entry[0]
+                loading = self._loading.get(voice_id)
+                if loading is None:
+                    loading = self._loading[voice_id] = threading.Event()
+                    break
+            # Outra thread está carregando: espera e confere de novo (se a carga falhou, tenta aqui)
+            loading.wait()
+        try:
+            voice = build_piper_voice(model_path, config_path or model_path + ".parquet")
+            try:
+                size = os.path.getsize(model_path)
+            except OSError:
+                size = 0
+            with self._lock:
+                self._voices[voice_id] = (voice, size)
+                self.loads += 1
+                self._evict(keep=voice_id)
+            return voice
+        finally:
+            with self._lock:
+                self._loading.pop(voice_id, None)
+            loading.set()
+
+    def _evict(self, keep: str) -> None:
+        """Remove as vozes menos usadas até respeitar os limites (nunca a recém-usada)."""
+        while len(self._voices) > 1 and (
+            len(self._voices) > self.max_voices or self.resident_bytes() > self.max_bytes
+        ):
+            oldest = next(iter(self._voices))
+            if oldest == keep:
+                break
+            del self._voices[oldest]
+
+    def resident_bytes(self) -> int:
+        return sum(size for _, size in self._voices.values())
+
+    def loaded_ids(self) -> list[str]:
+        with self._lock:
+            return list(self._voices.keys())
+
+    def clear(self) -> None:
+        with self._lock:
+            self._voices.clear()
+
+
+_POOL: Optional[VoicePool] = None
+_POOL_LOCK = threading.Lock()
+
+
+def get_voice_pool() -> VoicePool:
+    """Pool compartilhado pelo processo (limites via TTS_VOICE_POOL_MAX e TTS_VOICE_POOL_MAX_MB)."""
+    global _POOL
+    with _POOL_LOCK:
+        if _POOL is None:
+            _POOL = VoicePool(
+                max_voices=int(os.environ.get("TTS_VOICE_POOL_MAX", "8")),
+                max_bytes=int(os.environ.get("TTS_VOICE_POOL_MAX_MB", "512")) * 1024 * 1024,
+            )
+        return _POOL
@@ -0,0 +1,139 @@
+import os
+import time
+import queue
+import itertools
+import threading
+import traceback
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Optional
+from uuid import uuid4
+
+
+@dataclass
+class Job:
+    """Job assíncrono (ex: geração de entrevista) com status e progresso."""
+    kind: str
+    priority: int = 10
+    id: str = field(default_factory=lambda: uuid4().hex)
+    status: str = "queued"  # queued | running | done | failed
+    done: int = 0
+    total: int = 0
+    output: Any = None
+    error: Optional[str] = None
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+
+    def report_progress(self, done: int, total: int) -> None:
+        self.done = done
+        self.total = total
+
+    def to_dict(self) -> dict:
+        return {
+            "job_id": self.id,
+            "kind": self.kind,
+            "priority": self.priority,
+            "status": self.status,
+            "progress": {"done": self.done, "total": self.total},
+            "output": self.output,
+            "error": self.error,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+
+
+class JobQueue:
+    """Fila de prioridade (menor valor = mais prioritário) consumida por um pool fixo de threads.
+
+    Cada job executa `fn(job)` fora do event loop; jobs finalizados ficam
+    disponíveis para consulta até o limite `max_finished`.
+    """
+
+    def __init__(self, workers: int = 1, max_finished: int = 1000):
+        self.workers = max(1, workers)
+        self.max_finished = max_finished
+        self._queue: "queue.PriorityQueue[tuple[int, int, Optional[str]]]" = queue.PriorityQueue()
+        self._seq = itertools.count()
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._fns: dict[str, Callable[[Job], Any]] = {}
+        self._lock = threading.Lock()
+        self._threads: list[threading.Thread] = []
+
+    def start(self) -> None:
+        with self._lock:
+            if self._threads:
+                return
+            for i in range(self.workers):
+                t = threading.Thread(target=self._worker, name=f"tts-job-worker-{i}", daemon=True)
+                t.start()
+                self._threads.append(t)
+
+    def stop(self) -> None:
+        """Sinaliza o fim para os workers (jobs em andamento terminam normalmente)."""
+        with self._lock:
+            threads, self._threads = self._threads, []
+        for _ in threads:
+            # Sentinela no fim da fila: jobs já enfileirados são processados antes
+            self._queue.put((2 ** 31, next(self._seq), None))
+        for t in threads:
+            t.join(timeout=1.0)
+
+    def submit(self, kind: str, fn: Callable[[Job], Any], priority: int = 10) -> Job:
+        self.start()
+        job = Job(kind=kind, priority=priority)
+        with self._lock:
+            self._jobs[job.id] = job
+            self._fns[job.id] = fn
+            self._prune()
+        self._queue.put((priority, next(self._seq), job.id))
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def _prune(self) -> None:
+        finished = [jid for jid, j in self._jobs.items() if j.status in ("done", "failed")]
+        for jid in finished[: max(0, len(finished) - self.max_finished)]:
+            del self._jobs[jid]
+
+    def _worker(self) -> None:
+        while True:
+            _, _, job_id = self._queue.get()
+            if job_id is None:
+                break
+            with self._lock:
+                job = self._jobs.get(job_id)
+                fn = self._fns.pop(job_id, None)
+            if job is None or fn is None:
+                continue
+            job.status = "running"
+            job.started_at = time.time()
+            try:
+                job.output = fn(job)
+                job.status = "done"
+            except Exception as e:
+                job.error = f"{e}\n{traceback.format_exc(limit=5)}"
+                job.status = "failed"
+            finally:
+                job.finished_at = time.time()
+
+
+def default_workers() -> int:
+    """Número de workers: TTS_JOB_WORKERS ou núcleos / 3 (cada LLM usa n_threads=3)."""
+    env = os.environ.get("TTS_JOB_WORKERS")
+    if env:
+        return max(1, int(env))
+    return max(1, (os.cpu_count() or 3) // 3)
+
+
+_JOBS: Optional[JobQueue] = None
+
+
+def get_job_queue() -> JobQueue:
+    global _JOBS
+    if _JOBS is None:
+        _JOBS = JobQueue(workers=default_workers())
+    return _JOBS
@@ -0,0 +1,188 @@
+import os
+import sys
+from typing import Callable, Iterator, Optional
+
+if 'scripts' not in sys.path:
+    sys.path.append('scripts')
+
+from audio_generation import interview_sample_rate, stream_interview_audio
+from interview_generator import WARM_TASKS, InterviewGenerator, InterviewGeneratorBuilder
+from interview_pipeline import LANGUAGE_PROFILES, interview_voice_paths, run_interview, voices_available
+from voice_pool import get_voice_pool
+from voice_index import available_voices
+from synthesis import get_synthesis_scheduler
+from model_manager import get_model_manager
+from topic_cache import close_topic_cache, get_topic_cache
+from dialogue_stream import default_queue_size, prefetch
+from batch_interviews import run_batch
+from tts_health import get_tts_health
+from qdrant_writer import get_qdrant_writer
+from qdrant_store import close_qdrant_client, get_qdrant_client, qdrant_server_mode
+from embedder import get_embedder
+import query_qdrant as qdrant_queries
+
+# Vozes usadas pelas entrevistas, aquecidas no startup
+INTERVIEW_VOICES = interview_voice_paths()
+# Idiomas aceitos pela API (os registrados em LANGUAGE_PROFILES)
+SUPPORTED_LANGS = tuple(LANGUAGE_PROFILES)
+
+
+class TTSEngine:
+    """Mantém em memória tudo o que os scripts recarregavam a cada requisição:
+    modelos GGUF, vozes Piper, embedder e cliente Qdrant.
+
+    Criado uma vez no lifespan da aplicação FastAPI.
+    """
+
+    def __init__(self, warmup_models: Optional[list[str]] = None):
+        self.warmup_models = warmup_models if warmup_models is not None else ["fast"]
+        self.qdrant = None
+        self.embedder = None
+
+    def startup(self) -> None:
+        """Pré-carrega modelos e vozes (e embedder/Qdrant quando o Qdrant é um servidor)."""
+        get_model_manager().warmup(self.warmup_models)
+        if os.environ.get("TTS_PROMPT_CACHE_WARM", "1") == "1" and os.environ.get("TTS_PROMPT_CACHE", "ram") != "off":
+            # Pré-calcula o KV dos system prompts fixos de cada modelo aquecido
+            langs, tasks = self._prompt_warm_targets()
+            for model_type in get_model_manager().loaded():
+                InterviewGeneratorBuilder().set_model_type(model_type).build().warm_prompt_cache(langs, tasks)
+        pool = get_voice_pool()
+        for model_path in INTERVIEW_VOICES:
+            if os.path.exists(model_path) and os.path.exists(model_path + ".parquet"):
+                pool.get(model_path)
+        if qdrant_server_mode():
+            # Servidor: conexão e coleções prontas no startup. No modo embutido o diretório
+            # fica travado enquanto o cliente está aberto, então ele só abre no primeiro uso
+            get_qdrant_writer(*self._ensure_qdrant())
+        if os.environ.get("TTS_SELF_TEST", "startup") != "off":
+            # Self-test único com as vozes já quentes; o resultado fica em cache para /health/tts
+            report = self.health(refresh=True)
+            print(f"Self-test TTS: {'ok' if report['ok'] else 'FALHOU'} ({report['duration_ms']} ms)")
+
+    @staticmethod
+    def _prompt_warm_targets() -> tuple[list[str], tuple[str, ...]]:
+        """Idiomas e tarefas a aquecer: TTS_PROMPT_CACHE_WARM_LANGS (padrão: idiomas com as vozes
+        instaladas) e TTS_PROMPT_CACHE_WARM_TASKS (padrão: todas de WARM_TASKS), separados por vírgula."""
+        env_langs = os.environ.get("TTS_PROMPT_CACHE_WARM_LANGS")
+        if env_langs:
+            langs = [l.strip() for l in env_langs.split(",") if l.strip() in LANGUAGE_PROFILES]
+        else:
+            langs = [lang for lang, profile in LANGUAGE_PROFILES.items() if voices_available(profile)]
+        env_tasks = os.environ.get("TTS_PROMPT_CACHE_WARM_TASKS")
+        tasks = tuple(t.strip() for t in env_tasks.split(",") if t.strip() in WARM_TASKS) if env_tasks else WARM_TASKS
+        return langs, tasks
+
+    def health(self, refresh: bool = False) -> dict:
+        """Resultado do self-test das vozes das entrevistas (latência por voz), em cache."""
+        return get_tts_health(INTERVIEW_VOICES).report(refresh=refresh)
+
+    def shutdown(self) -> None:
+        # Grava os pontos ainda na fila antes de fechar o cliente compartilhado
+        close_qdrant_client()
+        self.qdrant = None
+        get_model_manager().shutdown()
+        get_synthesis_scheduler().shutdown()
+        get_voice_pool().clear()
+        close_topic_cache()
+
+    def _ensure_qdrant(self):
+        # Cliente sempre do registro: após um shutdown, o próximo uso abre um cliente novo
+        self.qdrant = get_qdrant_client()
+        if self.embedder is None:
+            self.embedder = get_embedder()
+        return self.qdrant, self.embedder
+
+    def generator(self, model_type: str, specialist: Optional[str]) -> InterviewGenerator:
+        """Monta um gerador leve; o modelo vem do gerenciador e Qdrant/embedder do engine."""
+        builder = InterviewGeneratorBuilder().set_model_type(model_type)
+        if specialist:
+            builder.set_specialist(specialist)
+            qdrant, embedder = self._ensure_qdrant()
+            builder.set_qdrant(qdrant).set_embedder(embedder)
+        return builder.build()
+
+    def run_tts(
+        self,
+        model: str,
+        specialist: Optional[str],
+        langs: list[str],
+        topic_subject: Optional[str],
+        selected_topic: Optional[str],
+        progress: Optional[Callable[[int, int], None]] = None,
+    ) -> dict:
+        """Executa a geração. `progress(done, total)` recebe as linhas sintetizadas acumuladas entre as línguas."""
+        generator = self.generator(model, specialist)
+        if topic_subject and not selected_topic:
+            # Apenas sugerir tópicos
+            return {"topics": self.suggest_topics(model, specialist, "en", topic_subject)}
+
+        outputs = {}
+        timings = {}
+        base = 0  # linhas dos idiomas já concluídos
+        current = [0]  # total de linhas do idioma em andamento
+
+        def lang_progress(done: int, total: int) -> None:
+            current[0] = total
+            if progress is not None:
+                progress(base + done, base + total)
+
+        for lang in LANGUAGE_PROFILES:
+            if lang not in langs:
+                continue
+            current[0] = 0
+            ctx = run_interview(lang, model, specialist, selected_topic, generator=generator, progress=lang_progress)
+            outputs[lang] = ctx.output_path if ctx is not None else None
+            if ctx is not None:
+                timings[lang] = ctx.timings
+            base += current[0]
+        return {"outputs": outputs, "timings": timings}
+
+    def run_batch(
+        self,
+        manifest_path: str,
+        output_dir: str,
+        queue_size: int = 2,
+        progress: Optional[Callable[[int, int], None]] = None,
+    ) -> dict:
+        """Gera o lote do manifesto com os modelos/vozes já carregados; `progress(done, total)` em itens."""
+        return run_batch(manifest_path, output_dir, queue_size=queue_size, generator_factory=self.generator, progress=progress)
+
+    def stream_tts(self, model: str, specialist: Optional[str], lang: str, selected_topic: Optional[str], fmt: str = "wav") -> tuple[Iterator[bytes], int]:
+        """Retorna (iterador de bytes de áudio, sample_rate); cada fala sai assim que é sintetizada."""
+        generator = self.generator(model, specialist)
+        lines = generator.stream_dialogue(lang, selected_topic)
+        queue_size = default_queue_size()
+        if queue_size is not None:
+            # Decodificação do LLM segue em outra thread enquanto a fala anterior é sintetizada
+            lines = prefetch(lines, queue_size)
+        return stream_interview_audio(lines, lang=lang, fmt=fmt), interview_sample_rate(lang)
+
+    def list_voices(self, lang: Optional[str] = None, gender: Optional[str] = None) -> list[dict]:
+        return available_voices(lang, gender)
+
+    def query_qdrant(self, query_text: str, top_k: int = 1, offset: int = 0, **filters) -> dict:
+        """Busca nativa no Qdrant (top-k, paginação, filtros de payload) e o diff do melhor par gerado/corrigido."""
+        qdrant, embedder = self._ensure_qdrant()
+        pairs = qdrant_queries.search_text(query_text, qdrant, embedder, top_k=top_k, offset=offset, **filters)
+        return {"report": qdrant_queries.diff_report(pairs), "results": pairs}
+
+    def suggest_topics(self, model: str, specialist: Optional[str], lang: str, subject: str) -> list[str]:
+        generator = self.generator(model, specialist)
+        cache = get_topic_cache()
+        if generator.embedder is None and cache is not None and cache.similarity > 0:
+            # Acertos por assunto parecido precisam só do embedder: o Qdrant não é aberto aqui
+            generator.embedder = get_embedder()
+        return generator.suggest_topics(subject, target_lang=lang)
+
+
+_ENGINE: Optional[TTSEngine] = None
+
+
+def get_engine() -> TTSEngine:
+    """Engine compartilhado pelo processo (modelos aquecidos via TTS_WARMUP_MODELS, ex: "fast,reasoning")."""
+    global _ENGINE
+    if _ENGINE is None:
+        warmup = [m for m in os.environ.get("TTS_WARMUP_MODELS", "fast").split(",") if m.strip()]
+        _ENGINE = TTSEngine(warmup_models=[m.strip() for m in warmup])
+    return _ENGINE
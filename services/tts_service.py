@@ -1,38 +1,43 @@
-import subprocess
-import sys
-from typing import Optional
+from typing import Iterator, Optional
+from services.tts_engine import SUPPORTED_LANGS, TTSEngine, get_engine
+from services.job_queue import Job, JobQueue, get_job_queue
 
 class TTSService:
-    def run_tts(self, model: str, specialist: Optional[str], langs: list[str], topic_subject: Optional[str], selected_topic: Optional[str]) -> str:
-        cmd = [sys.executable, "scripts/run_tts.py", "--model", model]
-        if specialist:
-            cmd.extend(["--specialist", specialist])
-        if langs:
-            cmd.extend(["--langs", *langs])
-        if topic_subject:
-            cmd.extend(["--topic-subject", topic_subject])
-        if selected_topic:
-            cmd.extend(["--selected-topic", selected_topic])
-
-        result = subprocess.run(cmd, capture_output=True, text=True, cwd=".")
-        if result.returncode != 0:
-            raise Exception(f"Erro ao executar run_tts: {result.stderr}")
-        return result.stdout
-
-    def query_qdrant(self, query_text: str) -> str:
-        cmd = [sys.executable, "scripts/query_qdrant.py", query_text]
-        result = subprocess.run(cmd, capture_output=True, text=True, cwd=".")
-        if result.returncode != 0:
-            raise Exception(f"Erro ao executar query_qdrant: {result.stderr}")
-        return result.stdout
+    """Serviço usado pelas rotas; delega ao engine em processo (sem subprocessos por requisição)."""
+
+    def __init__(self, engine: Optional[TTSEngine] = None, jobs: Optional[JobQueue] = None):
+        self.engine = engine or get_engine()
+        self.jobs = jobs or get_job_queue()
+
+    def run_tts(self, model: str, specialist: Optional[str], langs: list[str], topic_subject: Optional[str], selected_topic: Optional[str]) -> dict:
+        return self.engine.run_tts(model, specialist, langs, topic_subject, selected_topic)
+
+    def submit_run_tts(self, model: str, specialist: Optional[str], langs: list[str], topic_subject: Optional[str], selected_topic: Optional[str], priority: int = 10) -> Job:
+        """Enfileira a geração e retorna o job imediatamente."""
+        def task(job: Job) -> dict:
+            return self.engine.run_tts(model, specialist, langs, topic_subject, selected_topic, progress=job.report_progress)
+        return self.jobs.submit("run-tts", task, priority=priority)
+
+    def submit_batch(self, manifest_path: str, output_dir: str, queue_size: int = 2, priority: int = 20) -> Job:
+        """Enfileira um lote de entrevistas (manifesto CSV/JSONL/Parquet); retomável no mesmo `output_dir`."""
+        def task(job: Job) -> dict:
+            return self.engine.run_batch(manifest_path, output_dir, queue_size, progress=job.report_progress)
+        return self.jobs.submit("batch", task, priority=priority)
+
+    def stream_tts(self, model: str, specialist: Optional[str], lang: str, selected_topic: Optional[str], fmt: str = "wav") -> tuple[Iterator[bytes], int]:
+        return self.engine.stream_tts(model, specialist, lang, selected_topic, fmt)
+
+    def get_job(self, job_id: str) -> Optional[Job]:
+        return self.jobs.get(job_id)
+
+    def health(self, refresh: bool = False) -> dict:
+        return self.engine.health(refresh)
+
+    def list_voices(self, lang: Optional[str] = None, gender: Optional[str] = None) -> list[dict]:
+        return self.engine.list_voices(lang, gender)
+
+    def query_qdrant(self, query_text: str, top_k: int = 1, offset: int = 0, **filters) -> dict:
+        return self.engine.query_qdrant(query_text, top_k, offset, **filters)
 
     def suggest_topics(self, model: str, specialist: Optional[str], lang: str, subject: str) -> list[str]:
-        # Importa diretamente para evitar criar novo script
-        import sys
-        sys.path.append('scripts')
-        from interview_generator import InterviewGeneratorBuilder
-        builder = InterviewGeneratorBuilder().set_model_type(model)
-        if specialist:
-            builder.set_specialist(specialist)
-        gen = builder.build()
-        return gen.suggest_topics(subject, target_lang=lang)
\ No newline at end of file
+        return self.engine.suggest_topics(model, specialist, lang, subject)
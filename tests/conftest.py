@@ -0,0 +1,7 @@
+import os
+import sys
+
+# Os módulos de scripts/ são importados pelo nome (como em services/tts_engine.py)
+SCRIPTS_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "scripts"))
+if SCRIPTS_DIR not in sys.path:
+    sys.path.insert(0, SCRIPTS_DIR)
@@ -0,0 +1,68 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("soundfile")
+
+from audio_integrity import AudioStats
+
+SAMPLE_RATE = 1000  # janela de 20 amostras
+
+
+def signal():
+    # Alterna trechos de fala (RMS alto) e silêncio de tamanhos que não são múltiplos da janela
+    rng = np.random.default_rng(0)
+    parts = [
+        (rng.standard_normal(137) * 3000).astype(np.int16),
+        np.zeros(53, dtype=np.int16),
+        (rng.standard_normal(91) * 3000).astype(np.int16),
+        np.zeros(200, dtype=np.int16),
+        (rng.standard_normal(29) * 3000).astype(np.int16),
+    ]
+    return np.concatenate(parts)
+
+
+def fed_at_once(audio):
+    stats = AudioStats(SAMPLE_RATE)
+    stats.update(audio)
+    return stats
+
+
+@pytest.mark.parametrize("block", [1, 7, 19, 20, 21, 64])
+def test_silence_windows_independent_of_block_boundaries(block):
+    audio = signal()
+    expected = fed_at_once(audio)
+    stats = AudioStats(SAMPLE_RATE)
+    for start in range(0, len(audio), block):
+        stats.update(audio[start:start + block])
+    assert (stats.frames, stats.windows, stats.silent_windows) == (
+        expected.frames, expected.windows, expected.silent_windows
+    )
+    assert stats.sum_squares == pytest.approx(expected.sum_squares)
+
+
+@pytest.mark.parametrize("silence", [5, 15, 20, 47, 200])
+def test_update_silence_matches_zero_block(silence):
+    speech = signal()[:137]  # termina no meio de uma janela (carry de 17 amostras)
+    expected = fed_at_once(np.concatenate([speech, np.zeros(silence, dtype=np.int16), speech]))
+    stats = AudioStats(SAMPLE_RATE)
+    stats.update(speech)
+    stats.update_silence(silence)
+    stats.update(speech)
+    assert (stats.frames, stats.windows, stats.silent_windows) == (
+        expected.frames, expected.windows, expected.silent_windows
+    )
+
+
+def test_update_silence_from_empty_carry():
+    stats = AudioStats(SAMPLE_RATE)
+    stats.update_silence(45)
+    assert (stats.frames, stats.windows, stats.silent_windows) == (45, 2, 2)
+    stats.update(np.zeros(15, dtype=np.int16))
+    assert (stats.frames, stats.windows, stats.silent_windows) == (60, 3, 3)
+
+
+def test_float_blocks_are_scaled_to_int16():
+    stats = AudioStats(SAMPLE_RATE)
+    stats.update(np.full(40, 0.5, dtype=np.float32))
+    assert stats.peak == int(0.5 * 32767)
+    assert stats.silent_windows == 0
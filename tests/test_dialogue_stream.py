@@ -0,0 +1,105 @@
+import time
+import threading
+import pytest
+from dialogue_stream import STOP_TIMEOUT, DialogueStreamParser, parse_dialogue_line, prefetch
+
+DIALOGUE = "Sarah: Hi, welcome!\nLeo: Thanks for having me.\n\nSarah: Let's start.\nLeo: Sure"
+
+
+def parse_all(text):
+    lines = [line for line in text.split("\n") if line.strip()]
+    return [parse_dialogue_line(line, i) for i, line in enumerate(lines)]
+
+
+def feed_chunks(chunks):
+    parser = DialogueStreamParser()
+    lines = []
+    for chunk in chunks:
+        lines.extend(parser.feed(chunk))
+    return parser, lines + parser.close()
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 5, 7, len(DIALOGUE)])
+def test_parser_matches_full_text_for_any_chunk_size(size):
+    chunks = [DIALOGUE[i:i + size] for i in range(0, len(DIALOGUE), size)]
+    parser, lines = feed_chunks(chunks)
+    assert lines == parse_all(DIALOGUE)
+    assert parser.text == DIALOGUE
+
+
+def test_parser_splits_inside_speaker_prefix():
+    _, lines = feed_chunks(["Sar", "ah", ": Hello", " there\nL", "eo:", " Hi\n"])
+    assert lines == [("Sarah", "Hello there"), ("Leo", "Hi")]
+
+
+def test_close_emits_trailing_line_without_newline():
+    parser = DialogueStreamParser()
+    assert parser.feed("Sarah: One\nLeo: Two") == [("Sarah", "One")]
+    assert parser.close() == [("Leo", "Two")]
+    assert parser.close() == []
+
+
+def test_close_ignores_blank_tail():
+    parser = DialogueStreamParser()
+    assert parser.feed("Sarah: One\n  ") == [("Sarah", "One")]
+    assert parser.close() == []
+
+
+def test_unprefixed_lines_alternate_speakers():
+    _, lines = feed_chunks(["first\nsecond\n", "third"])
+    assert lines == [("Sarah", "first"), ("Leo", "second"), ("Sarah", "third")]
+
+
+def test_prefetch_yields_all_items_in_order():
+    assert list(prefetch(iter(range(20)), maxsize=2)) == list(range(20))
+
+
+def test_prefetch_early_stop_closes_source():
+    closed = threading.Event()
+
+    def source():
+        try:
+            for i in range(1000):
+                yield i
+        finally:
+            closed.set()
+
+    consumer = prefetch(source(), maxsize=2)
+    assert next(consumer) == 0
+    consumer.close()
+    # close() junta a thread do produtor, que já fechou o gerador
+    assert closed.is_set()
+
+
+def test_prefetch_close_does_not_wait_for_slow_next():
+    release = threading.Event()
+    closed = threading.Event()
+
+    def source():
+        try:
+            yield 0
+            release.wait(5)  # leitura lenta de token do LLM
+            yield 1
+        finally:
+            closed.set()
+
+    consumer = prefetch(source(), maxsize=1)
+    assert next(consumer) == 0
+    start = time.monotonic()
+    consumer.close()
+    assert time.monotonic() - start < STOP_TIMEOUT + 1
+    assert not closed.is_set()
+    # Quando o next() em andamento volta, o produtor fecha a fonte sozinho
+    release.set()
+    assert closed.wait(2)
+
+
+def test_prefetch_reraises_producer_exception():
+    def source():
+        yield "a"
+        raise RuntimeError("llm failed")
+
+    consumer = prefetch(source())
+    assert next(consumer) == "a"
+    with pytest.raises(RuntimeError, match="llm failed"):
+        next(consumer)
@@ -0,0 +1,30 @@
+from llm_budget import CTX_ALIGN, fit_max_tokens, required_n_ctx, task_context_tokens
+
+
+def test_fit_max_tokens_keeps_budget_when_it_fits():
+    assert fit_max_tokens(100, 500, 4096) == 500
+
+
+def test_fit_max_tokens_shrinks_to_context():
+    assert fit_max_tokens(4000, 500, 4096) == 4096 - 4000 - 8
+
+
+def test_fit_max_tokens_never_below_one():
+    assert fit_max_tokens(5000, 500, 4096) == 1
+
+
+def test_required_n_ctx_is_aligned_and_covers_every_task(monkeypatch):
+    monkeypatch.delenv("TTS_LLM_N_CTX", raising=False)
+    n_ctx = required_n_ctx()
+    assert n_ctx % CTX_ALIGN == 0
+    assert n_ctx >= max(task_context_tokens().values())
+
+
+def test_required_n_ctx_respects_ceiling(monkeypatch):
+    monkeypatch.delenv("TTS_LLM_N_CTX", raising=False)
+    assert required_n_ctx(ceiling=1024) == 1024
+
+
+def test_required_n_ctx_env_override(monkeypatch):
+    monkeypatch.setenv("TTS_LLM_N_CTX", "3000")
+    assert required_n_ctx(ceiling=1024) == 3000
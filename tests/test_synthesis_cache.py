@@ -0,0 +1,52 @@
+import os
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from synthesis_cache import SynthesisCache
+
+
+def audio(n, value=1000):
+    return np.full(n, value, dtype=np.int16)
+
+
+def test_put_get_round_trip(tmp_path):
+    cache = SynthesisCache(str(tmp_path))
+    key = cache.make_key("voice", "cfg", "Hello  world")
+    assert cache.get(key) is None
+    cache.put(key, audio(100), 22050)
+    data, sample_rate = cache.get(key)
+    assert sample_rate == 22050
+    assert np.array_equal(data, audio(100))
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+
+
+def test_key_normalizes_whitespace():
+    assert SynthesisCache.make_key("v", "c", " Hello \n world ") == SynthesisCache.make_key("v", "c", "Hello world")
+
+
+def test_overwriting_key_does_not_double_count_bytes(tmp_path):
+    cache = SynthesisCache(str(tmp_path))
+    cache.put(cache.make_key("v", "c", "first"), audio(100), 16000)  # primeiro put faz o scan
+    key = cache.make_key("v", "c", "second")
+    for n in (100, 300, 50):
+        cache.put(key, audio(n), 16000)
+        assert cache.stats()["bytes"] == cache._scan_bytes()
+
+
+def test_eviction_removes_least_recently_used(tmp_path):
+    cache = SynthesisCache(str(tmp_path), max_bytes=10 ** 9)
+    keys = [cache.make_key("v", "c", f"text {i}") for i in range(4)]
+    for i, key in enumerate(keys):
+        cache.put(key, audio(1000), 16000)
+        os.utime(cache._path(key), (1000 + i, 1000 + i))
+    entry_size = os.path.getsize(cache._path(keys[0]))
+    # Limite de 4.2 entradas: o 5º put passa dele e a limpeza desce a 90% (3.78), removendo as 2 mais antigas
+    cache.max_bytes = int(entry_size * 4.2)
+    new_key = cache.make_key("v", "c", "new")
+    cache.put(new_key, audio(1000), 16000)
+    assert not os.path.exists(cache._path(keys[0]))
+    assert not os.path.exists(cache._path(keys[1]))
+    assert os.path.exists(cache._path(keys[2]))
+    assert os.path.exists(cache._path(new_key))
+    assert cache.stats()["bytes"] == cache._scan_bytes() <= int(cache.max_bytes * 0.9)
@@ -0,0 +1,66 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+import topic_cache
+from topic_cache import TopicCache
+
+TOPICS = ["a", "b", "c", "d", "e"]
+
+
+class Clock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(topic_cache.time, "time", clock.time)
+    return clock
+
+
+def test_exact_hit_ignores_case_and_spaces(tmp_path, clock):
+    cache = TopicCache(str(tmp_path / "topics.sqlite3"))
+    cache.put("Job  Interviews", "en", "fast", None, TOPICS)
+    assert cache.get(" job interviews ", "en", "fast", None) == TOPICS
+    assert cache.get("job interviews", "es", "fast", None) is None
+    cache.close()
+
+
+def test_entries_expire_after_ttl(tmp_path, clock):
+    cache = TopicCache(str(tmp_path / "topics.sqlite3"), ttl=60)
+    cache.put("travel", "en", "fast", None, TOPICS)
+    clock.now += 59
+    assert cache.get("travel", "en", "fast", None) == TOPICS
+    clock.now += 2
+    assert cache.get("travel", "en", "fast", None) is None
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+    cache.close()
+
+
+def test_eviction_keeps_most_recently_used(tmp_path, clock):
+    cache = TopicCache(str(tmp_path / "topics.sqlite3"), max_entries=2)
+    cache.put("one", "en", "fast", None, ["1"])
+    clock.now += 1
+    cache.put("two", "en", "fast", None, ["2"])
+    clock.now += 1
+    assert cache.get("one", "en", "fast", None) == ["1"]  # "one" passa a ser o mais recente
+    clock.now += 1
+    cache.put("three", "en", "fast", None, ["3"])
+    assert cache.stats()["entries"] == 2
+    assert cache.get("two", "en", "fast", None) is None
+    assert cache.get("one", "en", "fast", None) == ["1"]
+    assert cache.get("three", "en", "fast", None) == ["3"]
+    cache.close()
+
+
+def test_similar_subject_hits_through_embedding(tmp_path, clock):
+    cache = TopicCache(str(tmp_path / "topics.sqlite3"), similarity=0.9)
+    cache.put("travel tips", "en", "fast", None, TOPICS, embedding=np.array([1.0, 0.0, 0.0]))
+    assert cache.get("tips for travel", "en", "fast", None, embedding=np.array([0.95, 0.1, 0.0])) == TOPICS
+    assert cache.get("cooking", "en", "fast", None, embedding=np.array([0.0, 1.0, 0.0])) is None
+    cache.close()